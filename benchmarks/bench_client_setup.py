@@ -0,0 +1,61 @@
+# Per-hero setup cost of the bridge client: a fresh Web3, account and contract
+# for every hero (the old send path) against the cached ChainClient from
+# get_chain_client. No RPC calls are made by either path.
+# Run from the repository root:
+#     python benchmarks/bench_client_setup.py --heroes 200
+import argparse
+import os
+import sys
+import time
+
+from web3 import Web3
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import hero_bridge  # noqa: E402
+
+# Throwaway key, only used to derive an address
+PRIVATE_KEY = "0x" + "42" * 32
+
+
+def fresh_client(config_key):
+    w3 = Web3(Web3.HTTPProvider(hero_bridge.CONFIG["rpc_addresses"][config_key][0]))
+    account = w3.eth.account.from_key(PRIVATE_KEY)
+    contract = w3.eth.contract(
+        address=Web3.to_checksum_address(
+            hero_bridge.CONFIG["contract_addresses"][config_key]
+        ),
+        abi=hero_bridge.HERO_BRIDGE_ABI,
+    )
+    return w3, account, contract
+
+
+def cached_client(config_key):
+    return hero_bridge.get_chain_client(config_key, PRIVATE_KEY)
+
+
+def per_hero_us(setup, heroes):
+    started = time.perf_counter()
+    for _ in range(heroes):
+        setup("crystalvale")
+    return (time.perf_counter() - started) / heroes * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--heroes", type=int, default=200)
+    args = parser.parse_args()
+
+    fresh = per_hero_us(fresh_client, args.heroes)
+    started = time.perf_counter()
+    cached_client("crystalvale")
+    first = (time.perf_counter() - started) * 1e6
+    cached = per_hero_us(cached_client, args.heroes)
+    print(f"fresh Web3/account/contract: {fresh:.0f} us/hero")
+    print(f"ChainClient: {first:.0f} us once, then {cached:.1f} us/hero")
+
+
+if __name__ == "__main__":
+    main()
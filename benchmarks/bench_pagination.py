@@ -0,0 +1,63 @@
+# Compares skip and keyset pagination in fetch_heroes against the local stub.
+# Run from the repository root:
+#     python benchmarks/bench_pagination.py --heroes 20000
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import hero_bridge  # noqa: E402
+from stub_graphql import StubGraphQLServer, make_heroes  # noqa: E402
+
+
+def run(pagination, concurrency):
+    page_times = []
+    last_page = [time.perf_counter()]
+
+    def on_page(heroes):
+        now = time.perf_counter()
+        page_times.append(now - last_page[0])
+        last_page[0] = now
+
+    started = time.perf_counter()
+    result = hero_bridge.fetch_heroes(
+        hero_bridge.build_search_variables("0xstub"),
+        concurrency,
+        lambda message: None,
+        pagination=pagination,
+        on_page=on_page,
+    )
+    elapsed = time.perf_counter() - started
+    ids = [hero["id"] for hero in result.heroes]
+    assert result.complete, pagination
+    assert len(ids) == len(set(ids)), f"{pagination} returned duplicates"
+    return elapsed, page_times, len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--heroes", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=250)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    hero_bridge.CONFIG["search_page_size"] = args.page_size
+    with StubGraphQLServer(make_heroes(args.heroes)) as stub:
+        hero_bridge.CONFIG["graphql_url"] = stub.url
+        print(f"{args.heroes} heroes, page size {args.page_size}")
+        for pagination in ("skip", "keyset"):
+            elapsed, page_times, count = run(pagination, args.concurrency)
+            tail = page_times[-10:]
+            print(
+                f"{pagination:>6}: {count} heroes in {elapsed:.2f}s, "
+                f"first page {page_times[0] * 1000:.1f} ms, "
+                f"last 10 pages {sum(tail) / len(tail) * 1000:.1f} ms/page"
+            )
+
+
+if __name__ == "__main__":
+    main()
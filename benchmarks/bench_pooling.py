@@ -0,0 +1,71 @@
+# Per-page GraphQL latency through the pooled keep-alive session, compared with
+# a fresh connection per page, against the local stub.
+# Run from the repository root:
+#     python benchmarks/bench_pooling.py --pages 200
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import hero_bridge  # noqa: E402
+from stub_graphql import StubGraphQLServer, make_heroes  # noqa: E402
+
+
+def post_unpooled(query, variables, ui_update_function):
+    response = requests.post(
+        hero_bridge.CONFIG["graphql_url"],
+        json={"query": query, "variables": variables},
+        timeout=hero_bridge.CONFIG["graphql_timeout_seconds"],
+    )
+    return response.json()["data"]["heroes"]
+
+
+def time_pages(post, pages):
+    variables = dict(
+        hero_bridge.build_search_variables("0xstub"),
+        first=hero_bridge.CONFIG["search_page_size"],
+    )
+    page_times = []
+    # Always the first page, so the stub's offset walk doesn't mask the
+    # connection cost being measured
+    for _ in range(pages):
+        started = time.perf_counter()
+        heroes = post(hero_bridge.HEROES_QUERY, dict(variables, skip_number=0), print)
+        page_times.append(time.perf_counter() - started)
+        assert heroes is not None
+    return page_times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=250)
+    args = parser.parse_args()
+
+    hero_bridge.CONFIG["search_page_size"] = args.page_size
+    with StubGraphQLServer(make_heroes(args.page_size)) as stub:
+        hero_bridge.CONFIG["graphql_url"] = stub.url
+        for name, post in (
+            ("unpooled", post_unpooled),
+            ("pooled", hero_bridge.post_graphql),
+        ):
+            connections = stub.connections
+            page_times = sorted(time_pages(post, args.pages))
+            print(
+                f"{name:>8}: mean {statistics.mean(page_times) * 1000:.2f} ms, "
+                f"p50 {page_times[len(page_times) // 2] * 1000:.2f} ms, "
+                f"p95 {page_times[int(len(page_times) * 0.95)] * 1000:.2f} ms, "
+                f"{stub.connections - connections} connections "
+                f"for {args.pages} pages"
+            )
+
+
+if __name__ == "__main__":
+    main()
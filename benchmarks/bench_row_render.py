@@ -0,0 +1,52 @@
+# Per-row cost of drawing heroes in the GUI: building the row segments with
+# HeroSearchApp.format_hero_row, and inserting them into a Text widget with
+# insert_hero_row. The widget timings need a display (or Xvfb).
+# Run from the repository root:
+#     python benchmarks/bench_row_render.py --heroes 5000
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+from hero_bridge_gui import HeroSearchApp  # noqa: E402
+from stub_graphql import make_heroes  # noqa: E402
+
+
+def per_row_us(function, heroes):
+    started = time.perf_counter()
+    for hero in heroes:
+        function(hero)
+    return (time.perf_counter() - started) / len(heroes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--heroes", type=int, default=5000)
+    args = parser.parse_args()
+
+    heroes = make_heroes(args.heroes)
+    # format_hero_row only reads the lookup tables, so no window is needed
+    app = HeroSearchApp.__new__(HeroSearchApp)
+    app.init_class_and_ability_mappings()
+    print(f"format_hero_row: {per_row_us(app.format_hero_row, heroes):.1f} us/row")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"insert_hero_row: skipped, no display ({e})")
+        return
+    root.withdraw()
+    text_widget = tk.Text(root)
+    app.configure_row_tags(text_widget)
+    insert_us = per_row_us(lambda hero: app.insert_hero_row(text_widget, hero), heroes)
+    print(f"insert_hero_row: {insert_us:.1f} us/row")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
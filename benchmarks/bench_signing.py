@@ -0,0 +1,73 @@
+# Signing throughput of build_send_hero_transaction, plus the calldata encoding
+# on its own against web3's contract.encodeABI. Any RPC call made while
+# building fails the run, since every field is meant to be supplied up front.
+# Run from the repository root:
+#     python benchmarks/bench_signing.py --transactions 100
+import argparse
+import os
+import sys
+import time
+
+from eth_account import Account
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import hero_bridge  # noqa: E402
+
+# Throwaway key, never funded
+PRIVATE_KEY = "0x" + "42" * 32
+FEES_IN_WEI = {"maxFeePerGas": 30 * 10**9, "maxPriorityFeePerGas": 2 * 10**9}
+
+
+def refuse_rpc(self, method, params):
+    raise AssertionError(f"unexpected RPC call {method} while signing")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=100)
+    args = parser.parse_args()
+
+    hero_bridge.RPCPoolProvider.make_request = refuse_rpc
+    account = Account.from_key(PRIVATE_KEY)
+    client = hero_bridge.get_chain_client("crystalvale", PRIVATE_KEY)
+    hero_ids = range(1, args.transactions + 1)
+
+    started = time.perf_counter()
+    for hero_id in hero_ids:
+        client.contract.encodeABI(fn_name="sendHero", args=[hero_id, 8217])
+    encode_abi = (time.perf_counter() - started) / args.transactions * 1e6
+
+    started = time.perf_counter()
+    for hero_id in hero_ids:
+        hero_bridge.encode_send_hero_call(hero_id, 8217)
+    encode_direct = (time.perf_counter() - started) / args.transactions * 1e6
+
+    started = time.perf_counter()
+    for nonce, hero_id in enumerate(hero_ids):
+        hero_bridge.build_send_hero_transaction(
+            account,
+            client.contract.address,
+            client.chain_id,
+            hero_id,
+            8217,
+            10**16,
+            nonce,
+            FEES_IN_WEI,
+            150000,
+        )
+    elapsed = time.perf_counter() - started
+
+    print(f"contract.encodeABI: {encode_abi:.1f} us/call")
+    print(f"encode_send_hero_call: {encode_direct:.1f} us/call")
+    print(
+        f"build_send_hero_transaction: {args.transactions} signed in "
+        f"{elapsed * 1000:.1f} ms ({args.transactions / elapsed:.0f} tx/s), "
+        f"no RPC calls"
+    )
+
+
+if __name__ == "__main__":
+    main()
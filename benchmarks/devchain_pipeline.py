@@ -0,0 +1,109 @@
+# Exercises pipelined nonces against a local dev chain (anvil, hardhat node or
+# geth --dev): a batch of self-transfers is signed with NonceManager, sent back
+# to back and confirmed through one ReceiptTracker, then compared with sending
+# one transaction at a time. A second round withholds the first transaction of
+# the batch, as a node dropping it would, and checks that
+# wait_for_bridge_receipts' rebroadcast fills the nonce gap.
+# Run from the repository root with a dev chain listening:
+#     anvil --block-time 1 &
+#     python benchmarks/devchain_pipeline.py --rpc-url http://127.0.0.1:8545
+# DEVCHAIN_PRIVATE_KEY defaults to anvil and hardhat's first funded test key.
+import argparse
+import os
+import sys
+import time
+
+from eth_account import Account
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+import hero_bridge  # noqa: E402
+
+DEV_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+def sign_transfers(w3, account, nonces, fee_oracle, count):
+    chain_id = w3.eth.chain_id
+    fees = fee_oracle.current_fees()
+    return [
+        account.sign_transaction(
+            {
+                "type": 2,
+                "chainId": chain_id,
+                "nonce": nonces.allocate(),
+                "to": account.address,
+                "value": 0,
+                "gas": 21000,
+                **fees,
+            }
+        )
+        for _ in range(count)
+    ]
+
+
+def send_sequential(w3, account, nonces, fee_oracle, tracker, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        (signed_tx,) = sign_transfers(w3, account, nonces, fee_oracle, 1)
+        w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        assert tracker.track(signed_tx.hash, print).result(timeout=60).status == 1
+    return time.perf_counter() - started
+
+
+def send_pipelined(w3, account, nonces, fee_oracle, tracker, count, withhold_first):
+    started = time.perf_counter()
+    signed_txs = sign_transfers(w3, account, nonces, fee_oracle, count)
+    receipts = [tracker.track(signed_tx.hash, print) for signed_tx in signed_txs]
+    for signed_tx in signed_txs[1 if withhold_first else 0 :]:
+        w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    tx_receipts = hero_bridge.wait_for_bridge_receipts(
+        w3, tracker, list(zip(signed_txs, receipts)), 5, print
+    )
+    for signed_tx, tx_receipt in zip(signed_txs, tx_receipts):
+        assert tx_receipt is not None, f"{signed_tx.hash.hex()} never mined"
+        assert tx_receipt.status == 1
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rpc-url", default=os.environ.get("DEVCHAIN_RPC_URL", "http://127.0.0.1:8545")
+    )
+    parser.add_argument("--transactions", type=int, default=20)
+    args = parser.parse_args()
+
+    hero_bridge.CONFIG["rpc_addresses"]["devchain"] = args.rpc_url
+    hero_bridge.CONFIG["receipt_poll_seconds"] = 0.2
+    w3 = hero_bridge.make_chain_web3("devchain")
+    account = Account.from_key(os.environ.get("DEVCHAIN_PRIVATE_KEY", DEV_PRIVATE_KEY))
+    nonces = hero_bridge.NonceManager(w3, account.address)
+    fee_oracle = hero_bridge.FeeOracle(w3)
+    tracker = hero_bridge.ReceiptTracker(w3)
+    start_nonce = w3.eth.get_transaction_count(account.address, "pending")
+
+    sequential = send_sequential(
+        w3, account, nonces, fee_oracle, tracker, args.transactions
+    )
+    pipelined = send_pipelined(
+        w3, account, nonces, fee_oracle, tracker, args.transactions, False
+    )
+    print(
+        f"{args.transactions} transfers: sequential {sequential:.2f}s, "
+        f"pipelined {pipelined:.2f}s"
+    )
+
+    gap = send_pipelined(
+        w3, account, nonces, fee_oracle, tracker, args.transactions, True
+    )
+    print(f"{args.transactions} transfers with a withheld first nonce: {gap:.2f}s")
+
+    end_nonce = w3.eth.get_transaction_count(account.address, "latest")
+    assert end_nonce == start_nonce + 3 * args.transactions, (start_nonce, end_nonce)
+    print(f"nonces {start_nonce}..{end_nonce - 1} all mined, no gaps")
+
+
+if __name__ == "__main__":
+    main()
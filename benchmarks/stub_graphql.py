@@ -0,0 +1,95 @@
+# Local stand-in for the DFK GraphQL API, used by the benchmarks. It serves a
+# fixed set of heroes in `id desc` order and answers both page shapes that
+# fetch_hero_page sends: `skip` offsets and `id_lt` keyset pages. An offset is
+# resolved by walking past every skipped row, as a database without a usable
+# index does, while a keyset page seeks straight to its position.
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROFESSIONS = ("foraging", "fishing", "gardening", "mining")
+
+
+def make_heroes(count):
+    return [
+        {
+            "id": str(hero_id),
+            "mainClass": hero_id % 12,
+            "subClass": (hero_id // 12) % 12,
+            "summonsRemaining": hero_id % 11,
+            "passive1": hero_id % 8,
+            "passive2": (hero_id + 1) % 8,
+            "active1": (hero_id + 2) % 8,
+            "active2": (hero_id + 3) % 8,
+            "generation": hero_id % 15,
+            "rarity": hero_id % 5,
+            "level": 1 + hero_id % 20,
+            "network": "dfk" if hero_id % 2 else "kla",
+            "professionStr": PROFESSIONS[hero_id % 4],
+        }
+        for hero_id in range(count, 0, -1)
+    ]
+
+
+class StubGraphQLServer:
+    def __init__(self, heroes, latency=0.0):
+        self.heroes = heroes
+        # Negated ids ascend in the same order as the heroes, for bisect
+        self.keys = [-int(hero["id"]) for hero in heroes]
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                payload = json.dumps(
+                    {"data": {"heroes": stub.page(body["variables"])}}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/graphql"
+
+    def page(self, variables):
+        first = variables["first"]
+        if "last_id" in variables:
+            start = bisect.bisect_right(self.keys, -int(variables["last_id"]))
+        else:
+            start = 0
+            for _ in self.heroes[: variables["skip_number"]]:
+                start += 1
+        return self.heroes[start : start + first]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,22 +1,42 @@
 import os
+import sys
 import json
+import argparse
+import getpass
 import threading
 import time
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+import random
+import sqlite3
+from collections import deque, namedtuple
+from functools import partial
+from email.utils import parsedate_to_datetime
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    Future,
+    as_completed,
+    wait,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from web3 import Web3
+from web3.exceptions import ContractLogicError
+from web3.middleware import geth_poa_middleware
+from web3.providers.base import JSONBaseProvider
+from hexbytes import HexBytes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 from cryptography.fernet import Fernet
 import base64
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 
 # Configuration
 CONFIG = {
     "rpc_addresses": {
-        "serendale2": "https://klaytn.rpc.defikingdoms.com/",
-        "crystalvale": "https://subnets.avax.network/defi-kingdoms/dfk-chain/rpc",
+        "serendale2": ["https://klaytn.rpc.defikingdoms.com/"],
+        "crystalvale": ["https://subnets.avax.network/defi-kingdoms/dfk-chain/rpc"],
     },
     "contract_addresses": {
         "crystalvale": "0x739B1666c2956f601f095298132773074c3E184b",
@@ -24,10 +44,280 @@ CONFIG = {
     },
     "chain_ids": {"crystalvale": 53935, "serendale2": 8217},
     "fees_in_gwei": {"serendale2": 0.0045, "crystalvale": 0.075},
+    "bridge_pipeline_depth": 10,
+    "bridge_tx_timeout_seconds": 60,
+    "bridge_preflight": True,
+    "receipt_poll_seconds": 1,
+    "receipt_lookback_blocks": 2,
+    "arrival_poll_seconds": 5,
+    "arrival_lookback_blocks": 2,
+    "arrival_log_range_blocks": 2000,
+    "arrival_timeout_seconds": 1800,
+    "rpc_pool_size": 10,
+    "rpc_timeout_seconds": 30,
+    "rpc_probe_interval_seconds": 15,
+    "rpc_failure_cooldown_seconds": 30,
+    "rpc_max_block_lag": 5,
+    "rpc_health_smoothing": 0.2,
+    "rpc_batch_window_seconds": 0.005,
+    "rpc_batch_max_size": 100,
+    "fee_ttl_seconds": 15,
+    "gas_limit_margin": 0.2,
+    "gas_limit_ttl_seconds": 600,
+    "fee_policy": {
+        "history_blocks": 10,
+        "reward_percentile": 50,
+        "base_fee_multiplier": 2,
+        "min_priority_fee_gwei": 0,
+        "max_fee_cap_gwei": 1000,
+    },
+    "graphql_url": "https://api.defikingdoms.com/graphql",
+    "search_page_size": 250,
+    "search_concurrency": 4,
+    "search_pagination": "skip",
+    "graphql_timeout_seconds": (5, 30),
+    "graphql_retries": 4,
+    "graphql_backoff_seconds": 0.5,
+    "graphql_backoff_max_seconds": 30,
+    "hero_index_file": "hero_index.sqlite3",
+    "bridge_journal_file": "bridge_journal.jsonl",
+    "hero_index_max_age": 300,
+    "render_chunk_size": 500,
+    "log_flush_interval_ms": 100,
+    "log_max_lines": 2000,
 }
 
-w3_serendale2 = Web3(Web3.HTTPProvider(CONFIG["rpc_addresses"]["serendale2"]))
-w3_crystalvale = Web3(Web3.HTTPProvider(CONFIG["rpc_addresses"]["crystalvale"]))
+
+class RPCEndpoint:
+    # One RPC URL with its own keep-alive session and a running record of
+    # how fast and how reliably it has answered
+    def __init__(self, url):
+        self.url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONFIG["rpc_pool_size"])
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.lock = threading.Lock()
+        self.latency = None
+        self.error_rate = 0.0
+        self.failed_until = 0
+        self.block_number = None
+
+    def post(self, request_data):
+        started = time.monotonic()
+        try:
+            response = self.session.post(
+                self.url,
+                data=request_data,
+                headers={"Content-Type": "application/json"},
+                timeout=CONFIG["rpc_timeout_seconds"],
+            )
+            response.raise_for_status()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+        return response.content
+
+    def record_success(self, latency):
+        smoothing = CONFIG["rpc_health_smoothing"]
+        with self.lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += smoothing * (latency - self.latency)
+            self.error_rate -= smoothing * self.error_rate
+
+    def record_failure(self):
+        smoothing = CONFIG["rpc_health_smoothing"]
+        with self.lock:
+            self.error_rate += smoothing * (1 - self.error_rate)
+            self.failed_until = (
+                time.monotonic() + CONFIG["rpc_failure_cooldown_seconds"]
+            )
+
+    def rank(self, now, best_block_number):
+        # Endpoints that just failed or fell behind the chain head go last;
+        # the rest are ordered by expected cost, counting a likely failure as
+        # a full timeout
+        with self.lock:
+            unavailable = now < self.failed_until or (
+                self.block_number is not None
+                and best_block_number - self.block_number > CONFIG["rpc_max_block_lag"]
+            )
+            expected_seconds = (self.latency or 0) + self.error_rate * CONFIG[
+                "rpc_timeout_seconds"
+            ]
+        return unavailable, expected_seconds
+
+
+class RPCPoolProvider(JSONBaseProvider):
+    # Spreads a chain's JSON-RPC traffic over several endpoints: reads go to
+    # the healthiest one and fail over down the list, raw transactions go to
+    # all of them so one slow node cannot hold up a bridge
+    def __init__(self, urls):
+        super().__init__()
+        self.endpoints = [RPCEndpoint(url) for url in urls]
+        self.lock = threading.Lock()
+        self.probe_thread = None
+        self.pending_requests = []
+        self.broadcast_executor = ThreadPoolExecutor(
+            max_workers=len(self.endpoints) * CONFIG["rpc_pool_size"]
+        )
+
+    def ranked_endpoints(self):
+        now = time.monotonic()
+        best_block_number = max(
+            endpoint.block_number or 0 for endpoint in self.endpoints
+        )
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: endpoint.rank(now, best_block_number),
+        )
+
+    def make_request(self, method, params):
+        self.start_probing()
+        if method == "eth_sendRawTransaction":
+            request_data = self.encode_rpc_request(method, params)
+            if len(self.endpoints) > 1:
+                return self.broadcast(request_data)
+            return self.decode_rpc_response(self.post(request_data))
+        if CONFIG["rpc_batch_window_seconds"] <= 0:
+            request_data = self.encode_rpc_request(method, params)
+            return self.decode_rpc_response(self.post(request_data))
+        return self.queue_request(method, params).result()
+
+    def post(self, request_data):
+        last_error = None
+        for endpoint in self.ranked_endpoints():
+            try:
+                return endpoint.post(request_data)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def queue_request(self, method, params):
+        # Reads issued within one batch window, from any thread, are sent
+        # together as a single JSON-RPC batch
+        request_data = self.encode_rpc_request(method, params)
+        future = Future()
+        with self.lock:
+            self.pending_requests.append(
+                (json.loads(request_data)["id"], request_data, future)
+            )
+            if len(self.pending_requests) == 1:
+                timer = threading.Timer(
+                    CONFIG["rpc_batch_window_seconds"], self.flush_requests
+                )
+                timer.daemon = True
+                timer.start()
+            full = len(self.pending_requests) >= CONFIG["rpc_batch_max_size"]
+        if full:
+            self.flush_requests()
+        return future
+
+    def flush_requests(self):
+        with self.lock:
+            batch = self.pending_requests
+            self.pending_requests = []
+        if batch:
+            self.send_batch(batch)
+
+    def send_batch(self, batch):
+        try:
+            if len(batch) == 1:
+                responses = [self.decode_rpc_response(self.post(batch[0][1]))]
+            else:
+                responses = self.decode_rpc_response(
+                    self.post(b"[" + b",".join(data for _, data, _ in batch) + b"]")
+                )
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        # An endpoint that rejects batches answers with a single error, and
+        # some drop entries; anything unanswered is retried on its own
+        responses_by_id = {}
+        if isinstance(responses, list):
+            responses_by_id = {response.get("id"): response for response in responses}
+        for request_id, request_data, future in batch:
+            response = responses_by_id.get(request_id)
+            if response is None:
+                try:
+                    response = self.decode_rpc_response(self.post(request_data))
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(response)
+
+    def broadcast(self, request_data):
+        futures = [
+            self.broadcast_executor.submit(endpoint.post, request_data)
+            for endpoint in self.ranked_endpoints()
+        ]
+        # The first node to accept the transaction is enough; the others keep
+        # gossiping it in the background
+        error_response = None
+        last_error = None
+        for future in as_completed(futures):
+            try:
+                response = self.decode_rpc_response(future.result())
+            except Exception as e:
+                last_error = e
+                continue
+            if "error" not in response:
+                return response
+            if error_response is None:
+                error_response = response
+        if error_response is not None:
+            return error_response
+        raise last_error
+
+    def start_probing(self):
+        if len(self.endpoints) < 2:
+            return
+        with self.lock:
+            if self.probe_thread is None:
+                self.probe_thread = threading.Thread(target=self.probe, daemon=True)
+                self.probe_thread.start()
+
+    def probe(self):
+        while True:
+            for endpoint in self.endpoints:
+                try:
+                    response = self.decode_rpc_response(
+                        endpoint.post(self.encode_rpc_request("eth_blockNumber", []))
+                    )
+                    endpoint.block_number = int(response["result"], 16)
+                except Exception:
+                    pass
+            time.sleep(CONFIG["rpc_probe_interval_seconds"])
+
+
+def batch_calls(calls):
+    # Runs web3 calls side by side so they fall into one batch window and
+    # reach the node as a single request; returns a future per call
+    return [rpc_batch_executor.submit(call) for call in calls]
+
+
+rpc_batch_executor = ThreadPoolExecutor(max_workers=CONFIG["rpc_batch_max_size"])
+
+
+def make_chain_web3(config_key):
+    urls = CONFIG["rpc_addresses"][config_key]
+    if isinstance(urls, str):
+        urls = [urls]
+    w3 = Web3(RPCPoolProvider(urls))
+    # Both realms put more than 32 bytes of extraData in their block headers,
+    # which web3 rejects on get_block unless told the chain is POA-style
+    w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+    return w3
+
+
+w3_serendale2 = make_chain_web3("serendale2")
+w3_crystalvale = make_chain_web3("crystalvale")
+CHAIN_WEB3 = {"serendale2": w3_serendale2, "crystalvale": w3_crystalvale}
 
 
 def load_abi(file_name):
@@ -40,1258 +330,1784 @@ def load_abi(file_name):
 HERO_BRIDGE_ABI = load_abi("hero_bridge_abi.json")
 
 
-def send_hero(
-    origin_realm_contract_address,
+# sendHero(uint256,uint256) selector, so calldata can be encoded without
+# going through the contract object
+SEND_HERO_SELECTOR = bytes(Web3.keccak(text="sendHero(uint256,uint256)")[:4])
+
+
+def encode_send_hero_call(hero_id, destination_chain_id):
+    return Web3.to_hex(
+        SEND_HERO_SELECTOR
+        + int(hero_id).to_bytes(32, "big")
+        + int(destination_chain_id).to_bytes(32, "big")
+    )
+
+
+def build_send_hero_transaction(
+    account,
+    contract_address,
+    chain_id,
     hero_id,
     destination_chain_id,
     bridge_fee_in_wei,
-    private_key,
     nonce,
-    gas_price_gwei,
-    tx_timeout_seconds,
-    rpc_address,
-    ui_update_function,
+    fees_in_wei,
+    gas_limit,
 ):
-    w3 = Web3(Web3.HTTPProvider(rpc_address))
-    account = w3.eth.account.from_key(private_key)
-    w3.eth.default_account = account.address
+    # Every field is supplied up front, so building and signing never touch
+    # the node
+    tx = {
+        "type": 2,
+        "chainId": chain_id,
+        "to": contract_address,
+        "value": bridge_fee_in_wei,
+        "data": encode_send_hero_call(hero_id, destination_chain_id),
+        "nonce": nonce,
+        "gas": gas_limit,
+        "maxFeePerGas": fees_in_wei["maxFeePerGas"],
+        "maxPriorityFeePerGas": fees_in_wei["maxPriorityFeePerGas"],
+    }
+
+    return account.sign_transaction(tx)
+
+
+class NonceManager:
+    # Hands out consecutive nonces locally, so a batch of transactions can be
+    # signed and broadcast back to back without asking the node each time
+    def __init__(self, w3, address):
+        self.w3 = w3
+        self.address = address
+        self.lock = threading.Lock()
+        self.next_nonce = None
+
+    def allocate(self):
+        with self.lock:
+            if self.next_nonce is None:
+                self.next_nonce = self.w3.eth.get_transaction_count(
+                    self.address, "pending"
+                )
+            nonce = self.next_nonce
+            self.next_nonce += 1
+            return nonce
+
+    def resync(self):
+        # After a failed or dropped send the local sequence may have a gap, so
+        # the next allocation starts again from the node's pending count
+        with self.lock:
+            self.next_nonce = None
+
+
+class FeeOracle:
+    # Samples recent blocks for the next base fee and tips, and serves the
+    # result to every hero in a batch until it is CONFIG["fee_ttl_seconds"] old
+    def __init__(self, w3):
+        self.w3 = w3
+        self.lock = threading.Lock()
+        self.fees = None
+        self.sampled_at = 0
+
+    def current_fees(self):
+        with self.lock:
+            if (
+                self.fees is None
+                or time.monotonic() - self.sampled_at > CONFIG["fee_ttl_seconds"]
+            ):
+                try:
+                    self.fees = self.sample_fees()
+                    self.sampled_at = time.monotonic()
+                except Exception:
+                    # A stale sample is still better than failing the batch
+                    if self.fees is None:
+                        raise
+            return self.fees
+
+    def sample_fees(self):
+        policy = CONFIG["fee_policy"]
+        try:
+            history = self.w3.eth.fee_history(
+                policy["history_blocks"], "latest", [policy["reward_percentile"]]
+            )
+            # The last entry is the base fee of the next block
+            base_fee = history["baseFeePerGas"][-1]
+            rewards = sorted(reward[0] for reward in history.get("reward") or [])
+            priority_fee = rewards[len(rewards) // 2] if rewards else 0
+        except Exception:
+            latest_block = self.w3.eth.get_block("latest")
+            base_fee = latest_block.get("baseFeePerGas") or self.w3.eth.gas_price
+            priority_fee = 0
+
+        priority_fee = max(
+            priority_fee, Web3.to_wei(policy["min_priority_fee_gwei"], "gwei")
+        )
+        max_fee = min(
+            int(base_fee * policy["base_fee_multiplier"]) + priority_fee,
+            Web3.to_wei(policy["max_fee_cap_gwei"], "gwei"),
+        )
+        return {
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": min(priority_fee, max_fee),
+        }
 
-    origin_realm_contract_address = Web3.to_checksum_address(
-        origin_realm_contract_address
-    )
-    contract = w3.eth.contract(
-        address=origin_realm_contract_address, abi=HERO_BRIDGE_ABI
-    )
 
-    tx = contract.functions.sendHero(hero_id, destination_chain_id)
+class GasLimitCache:
+    # sendHero costs about the same for every hero on a given contract, so one
+    # estimate plus a safety margin serves every transaction until it expires
+    # or a transaction runs out of gas
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gas_limits = {}
+
+    def gas_limit(self, client, hero_id, destination_chain_id, bridge_fee_in_wei):
+        key = (client.config_key, client.contract.address)
+        with self.lock:
+            cached = self.gas_limits.get(key)
+            if cached is not None and (
+                time.monotonic() - cached[1] < CONFIG["gas_limit_ttl_seconds"]
+            ):
+                return cached[0]
+
+            estimate = client.contract.functions.sendHero(
+                hero_id, destination_chain_id
+            ).estimate_gas({"from": client.account.address, "value": bridge_fee_in_wei})
+            gas_limit = int(estimate * (1 + CONFIG["gas_limit_margin"]))
+            self.gas_limits[key] = (gas_limit, time.monotonic())
+            return gas_limit
+
+    def invalidate(self, client):
+        with self.lock:
+            self.gas_limits.pop((client.config_key, client.contract.address), None)
+
+
+gas_limit_cache = GasLimitCache()
+
+
+class ChainClient:
+    # Everything a bridge needs on one origin chain for one account, built
+    # once per app session and reused by every hero bridged from that chain
+    def __init__(self, config_key, private_key):
+        self.config_key = config_key
+        self.chain_id = CONFIG["chain_ids"][config_key]
+        self.w3 = CHAIN_WEB3[config_key]
+        self.account = self.w3.eth.account.from_key(private_key)
+        self.contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(CONFIG["contract_addresses"][config_key]),
+            abi=HERO_BRIDGE_ABI,
+        )
+        self.nonces = NonceManager(self.w3, self.account.address)
+        self.receipt_tracker = ReceiptTracker(self.w3)
+        self.fee_oracle = FeeOracle(self.w3)
+
+
+chain_clients = {}
+chain_clients_lock = threading.Lock()
+
+
+def get_chain_client(config_key, private_key):
+    with chain_clients_lock:
+        client = chain_clients.get((config_key, private_key))
+        if client is None:
+            client = ChainClient(config_key, private_key)
+            chain_clients[(config_key, private_key)] = client
+        return client
+
+
+def bridge_route(hero):
+    if hero["network"] == "kla":
+        return "serendale2", CONFIG["chain_ids"]["crystalvale"]
+    if hero["network"] == "dfk":
+        return "crystalvale", CONFIG["chain_ids"]["serendale2"]
+    return None, None
+
+
+class ReceiptTracker:
+    # Watches every outstanding transaction on one chain with a single poll
+    # per new block: a block's transaction list is checked against all
+    # waiters at once and only matching transactions cost a receipt lookup
+    def __init__(self, w3):
+        self.w3 = w3
+        self.ui_update_function = None
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.thread = None
+        self.last_block = None
+
+    def track(self, tx_hash, ui_update_function):
+        key = Web3.to_hex(tx_hash)
+        with self.lock:
+            self.ui_update_function = ui_update_function
+            future = self.pending.get(key)
+            if future is None:
+                future = Future()
+                self.pending[key] = future
+            if self.thread is None:
+                # Start the scan from the block current now, before the caller
+                # broadcasts, so a transaction mined before the first poll
+                # cannot fall behind the look-back however long sending takes
+                try:
+                    self.last_block = self.scan_start(self.w3.eth.block_number)
+                except Exception:
+                    # poll picks the starting block once the node answers
+                    self.last_block = None
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return future
+
+    def scan_start(self, latest_block):
+        # A young chain (e.g. a local dev node) may have fewer blocks than
+        # the look-back
+        return max(latest_block - CONFIG["receipt_lookback_blocks"] - 1, -1)
+
+    def forget(self, tx_hash):
+        with self.lock:
+            self.pending.pop(Web3.to_hex(tx_hash), None)
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    self.last_block = None
+                    return
+            try:
+                self.poll()
+            except Exception as e:
+                self.ui_update_function(f"Error while polling receipts: {str(e)}")
+            time.sleep(CONFIG["receipt_poll_seconds"])
+
+    def poll(self):
+        latest_block = self.w3.eth.block_number
+        if self.last_block is None:
+            self.last_block = self.scan_start(latest_block)
+        # One batched round trip for all new blocks and one for the receipts
+        # of whatever matched. If anything fails the range is scanned again on
+        # the next poll; transactions already resolved are no longer pending.
+        blocks = batch_calls(
+            partial(self.w3.eth.get_block, block_number)
+            for block_number in range(self.last_block + 1, latest_block + 1)
+        )
+        blocks = [block.result() for block in blocks]
+        with self.lock:
+            matched = [
+                key
+                for block in blocks
+                for key in map(Web3.to_hex, block["transactions"])
+                if key in self.pending
+            ]
+        tx_receipts = batch_calls(
+            partial(self.w3.eth.get_transaction_receipt, key) for key in matched
+        )
+        for key, tx_receipt in zip(matched, tx_receipts):
+            tx_receipt = tx_receipt.result()
+            with self.lock:
+                future = self.pending.pop(key, None)
+            if future is not None:
+                future.set_result(tx_receipt)
+        self.last_block = latest_block
+
+
+HERO_ARRIVED_TOPIC = Web3.to_hex(Web3.keccak(text="HeroArrived(uint256,uint256)"))
+
+
+class ArrivalTracker:
+    # Confirms heroes landing on one destination chain by following the
+    # bridge's HeroArrived logs from a block cursor. Every hero in flight to
+    # the chain is matched by the same ranged eth_getLogs scan.
+    def __init__(self, w3, contract_address):
+        self.w3 = w3
+        self.contract_address = contract_address
+        self.ui_update_function = None
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.thread = None
+        self.last_block = None
+
+    def track(self, hero_id, sent_at, ui_update_function):
+        # Resolves to the seconds between sent_at and the arrival block, or
+        # None if the hero is not seen within CONFIG["arrival_timeout_seconds"]
+        key = str(int(hero_id))
+        with self.lock:
+            self.ui_update_function = ui_update_function
+            future = Future()
+            self.pending[key] = (
+                future,
+                sent_at,
+                time.monotonic() + CONFIG["arrival_timeout_seconds"],
+            )
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return future
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    self.last_block = None
+                    return
+            try:
+                self.poll()
+            except Exception as e:
+                self.ui_update_function(f"Error while scanning arrivals: {str(e)}")
+            time.sleep(CONFIG["arrival_poll_seconds"])
+
+    def poll(self):
+        now = time.monotonic()
+        with self.lock:
+            expired = [key for key, entry in self.pending.items() if entry[2] < now]
+            expired = [self.pending.pop(key)[0] for key in expired]
+            hero_topics = [
+                Web3.to_hex(int(key).to_bytes(32, "big")) for key in self.pending
+            ]
+        for future in expired:
+            future.set_result(None)
+        if not hero_topics:
+            return
 
-    tx = tx.build_transaction(
-        {
-            "maxFeePerGas": w3.to_wei(gas_price_gwei["maxFeePerGas"], "gwei"),
-            "maxPriorityFeePerGas": w3.to_wei(
-                gas_price_gwei["maxPriorityFeePerGas"], "gwei"
-            ),
-            "value": bridge_fee_in_wei,
-            "nonce": nonce,
-        }
-    )
+        latest_block = self.w3.eth.block_number
+        if self.last_block is None:
+            # Heroes are tracked once their send is mined, which is before
+            # they can arrive, so a short look-back is enough (clamped for
+            # chains younger than the look-back)
+            self.last_block = max(
+                latest_block - CONFIG["arrival_lookback_blocks"] - 1, -1
+            )
+        while self.last_block < latest_block:
+            to_block = min(
+                latest_block, self.last_block + CONFIG["arrival_log_range_blocks"]
+            )
+            logs = self.w3.eth.get_logs(
+                {
+                    "address": self.contract_address,
+                    "fromBlock": self.last_block + 1,
+                    "toBlock": to_block,
+                    "topics": [HERO_ARRIVED_TOPIC, hero_topics],
+                }
+            )
+            arrivals = {
+                str(int.from_bytes(log["topics"][1], "big")): log["blockNumber"]
+                for log in logs
+            }
+            block_numbers = sorted(set(arrivals.values()))
+            blocks = batch_calls(
+                partial(self.w3.eth.get_block, block_number)
+                for block_number in block_numbers
+            )
+            timestamps = {
+                block_number: block.result()["timestamp"]
+                for block_number, block in zip(block_numbers, blocks)
+            }
+            for key, block_number in arrivals.items():
+                with self.lock:
+                    entry = self.pending.pop(key, None)
+                if entry is not None:
+                    entry[0].set_result(max(0, timestamps[block_number] - entry[1]))
+            self.last_block = to_block
 
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key=private_key)
-    w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    ui_update_function("Transaction successfully sent!")
-    tx_receipt = w3.eth.wait_for_transaction_receipt(
-        transaction_hash=signed_tx.hash, timeout=tx_timeout_seconds, poll_latency=2
-    )
-    ui_update_function("Transaction mined!")
 
-    return tx_receipt
+arrival_trackers = {}
 
 
-def parse_class_input(user_input):
-    user_input = ", ".join(str(item) for item in user_input)
-    if user_input.strip().lower() == "none":
-        return None
-    main_classes = []
-    input_parts = user_input.replace(" ", "").split(",")
-    for part in input_parts:
-        if "-" in part:
-            start, end = part.split("-")
-            main_classes.extend(range(int(start), int(end) + 1))
-        elif part.startswith("[") and part.endswith("]"):
-            class_list = part[1:-1].split(";")
-            main_classes.extend([int(cls) for cls in class_list])
-        else:
-            main_classes.append(int(part))
-    return main_classes
-
+def get_arrival_tracker(config_key):
+    with chain_clients_lock:
+        tracker = arrival_trackers.get(config_key)
+        if tracker is None:
+            tracker = ArrivalTracker(
+                CHAIN_WEB3[config_key],
+                Web3.to_checksum_address(CONFIG["contract_addresses"][config_key]),
+            )
+            arrival_trackers[config_key] = tracker
+        return tracker
 
-class HeroSearchApp:
-    def __init__(self, master):
-        self.master = master
-        self.master.title("Hero Bridge Tool")
-        self.master.configure(bg="black")
-        self.master.geometry("1500x980")
-        self.persistent_selected_heroes = {}
-        self.configure_style()
-
-        # Create and place a container frame to hold all UI elements
-        self.container = ttk.Frame(self.master, style="TFrame")
-        self.container.pack(fill="both", expand=True)
-        self.create_frames()
-        self.init_class_and_ability_mappings()
-        self.main_class_selections = set()
-        self.sub_class_selections = set()
-        self.selected_heroes = []
-        self.init_ui_elements()
-
-    def configure_style(self):
-        style = ttk.Style()
-        style.configure("TFrame", background="black")
-        style.configure(
-            "TButton",
-            background="black",
-            foreground="white",
-            borderwidth=1,
-            focuscolor="none",
-        )
-        style.configure("TLabel", background="black", foreground="white")
-        style.map(
-            "TButton",
-            background=[("active", "grey"), ("!disabled", "black")],
-            foreground=[("active", "white")],
-        )
-        style.configure("TScale", background="black", foreground="white")
-        style.configure(
-            "TRadiobutton",
-            background="black",
-            foreground="white",
-            indicatorbackground="black",
-            indicatoron=False,
-        )
 
-    def create_frames(self):
-        self.search_frame = ttk.Frame(self.container, style="TFrame")
-        self.search_frame.grid(row=0, column=0, sticky="nsew")
-
-        self.results_frame = ttk.Frame(self.container, style="TFrame")
-        self.results_frame.grid(row=0, column=1, sticky="nsew", padx=10)
-
-        # Configure row and column weights for resizing
-        self.container.grid_rowconfigure(0, weight=1)
-        self.container.grid_columnconfigure(0, weight=1)  # Fixed width for search_frame
-        self.container.grid_columnconfigure(
-            1, weight=1
-        )  # Expandable width for results_frame
-
-    def init_class_and_ability_mappings(self):
-        self.rarity_map = {
-            0: "common",
-            1: "uncommon",
-            2: "rare",
-            3: "legendary",
-            4: "mythic",
+def wait_for_bridge_receipts(
+    w3, receipt_tracker, transactions, tx_timeout_seconds, ui_update_function
+):
+    # transactions are (signed_tx, future) pairs in nonce order, each future
+    # from receipt_tracker.track called before the broadcast. The window
+    # shares one deadline: a stuck nonce holds up every one above it, so only
+    # the lowest unconfirmed transaction is rebroadcast, once, and whatever is
+    # still unconfirmed after that is given up on together rather than waited
+    # out hero by hero. Returns a receipt or None per transaction.
+    deadline = time.monotonic() + tx_timeout_seconds
+    rebroadcast = False
+    tx_receipts = []
+    for signed_tx, future in transactions:
+        try:
+            tx_receipts.append(
+                future.result(timeout=max(0, deadline - time.monotonic()))
+            )
+            continue
+        except FutureTimeoutError:
+            pass
+        if not rebroadcast:
+            # The node may have dropped the transaction, leaving a nonce gap.
+            # Rebroadcasting the same signed transaction fills the gap and
+            # cannot double-send, since its nonce can only be used once.
+            rebroadcast = True
+            ui_update_function(
+                f"Transaction {signed_tx.hash.hex()} not mined yet, rebroadcasting..."
+            )
+            try:
+                w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception:
+                pass
+            deadline = time.monotonic() + tx_timeout_seconds
+            try:
+                tx_receipts.append(future.result(timeout=tx_timeout_seconds))
+                continue
+            except FutureTimeoutError:
+                pass
+        tx_receipts.append(None)
+
+    # One direct lookup before giving up, so a transaction the block scan
+    # missed is not reported as dropped and bridged a second time
+    missing = [
+        index for index, tx_receipt in enumerate(tx_receipts) if tx_receipt is None
+    ]
+    lookups = batch_calls(
+        partial(w3.eth.get_transaction_receipt, transactions[index][0].hash)
+        for index in missing
+    )
+    for index, lookup in zip(missing, lookups):
+        receipt_tracker.forget(transactions[index][0].hash)
+        try:
+            tx_receipts[index] = lookup.result()
+        except Exception:
+            pass
+    return tx_receipts
+
+
+# Journal states after which a hero needs no further work on restart
+BRIDGE_JOURNAL_UNFINISHED_STATES = ("queued", "signed", "broadcast", "dropped")
+
+JournaledTransaction = namedtuple("JournaledTransaction", ["hash", "rawTransaction"])
+
+
+class BridgeJournal:
+    # Append-only JSON-lines log of every bridge job's state changes, so a run
+    # that is cut short can be reconciled and resumed. Entries are buffered
+    # and fsynced once per send window rather than once per hero.
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+
+    def record(self, account_address, hero_id, chain, state, **fields):
+        entry = {
+            "account": account_address,
+            "hero_id": str(hero_id),
+            "chain": chain,
+            "state": state,
+            "time": time.time(),
         }
-
-        self.class_names = {
-            0: "Warrior",
-            1: "Knight",
-            2: "Thief",
-            3: "Archer",
-            4: "Priest",
-            5: "Wizard",
-            6: "Monk",
-            7: "Pirate",
-            8: "Berserker",
-            9: "Seer",
-            10: "Legionnaire",
-            11: "Scholar",
-            16: "Paladin",
-            17: "DarkKnight",
-            18: "Summoner",
-            19: "Ninja",
-            20: "Shapeshifter",
-            21: "Bard",
-            24: "Dragoon",
-            25: "Sage",
-            26: "Spellbow",
-            28: "DreadKnight",
+        entry.update(fields)
+        line = json.dumps(entry) + "\n"
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "a")
+            self.file.write(line)
+
+    def sync(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def unfinished(self, account_address=None):
+        self.sync()
+        if not os.path.exists(self.path):
+            return {}
+        jobs = {}
+        with open(self.path, "r") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half written
+                    continue
+                if account_address is not None and entry["account"] != account_address:
+                    continue
+                key = (entry["account"], entry["hero_id"])
+                # A queued entry starts a new job; later entries only add to it,
+                # so a hero keeps its nonce and transaction once signed
+                if entry["state"] == "queued" or key not in jobs:
+                    jobs[key] = entry
+                else:
+                    jobs[key].update(entry)
+        return {
+            hero_id: job
+            for (_, hero_id), job in jobs.items()
+            if job["state"] in BRIDGE_JOURNAL_UNFINISHED_STATES
         }
 
-        self.ability_names = {
-            0: "B1",
-            1: "B2",
-            2: "B3",
-            3: "B4",
-            4: "B5",
-            5: "B6",
-            6: "B7",
-            7: "B8",
-            16: "A1",
-            17: "A2",
-            18: "A3",
-            19: "A4",
-            24: "E1",
-            25: "E2",
-            28: "T1",
-        }
 
-    def init_ui_elements(self):
-        self.init_class_selection(
-            self.search_frame,
-            "Select Main Class",
-            self.main_class_selections,
-            0,
-            is_main_class=True,
+bridge_journal = BridgeJournal(os.path.join(os.getcwd(), CONFIG["bridge_journal_file"]))
+
+
+def resume_bridge_jobs(private_key, ui_update_function, on_bridged):
+    # Settles every unfinished job left in the journal by an earlier run.
+    # Signed transactions are looked up and, if still unconfirmed,
+    # rebroadcast as they are; their nonce can only ever be used once, so
+    # this cannot send a hero twice. Heroes that never got a transaction on
+    # chain are bridged again. Returns the ids of every hero handled and the
+    # arrival futures of the heroes bridged again.
+    account_address = w3_serendale2.eth.account.from_key(private_key).address
+    jobs = bridge_journal.unfinished(account_address)
+    if not jobs:
+        return set(), []
+    ui_update_function(f"Reconciling {len(jobs)} unfinished bridge jobs...")
+
+    requeued = []
+    jobs_by_chain = {}
+    for job in jobs.values():
+        if job.get("tx_hash"):
+            jobs_by_chain.setdefault(job["chain"], []).append(job)
+        else:
+            requeued.append(job)
+
+    for config_key, chain_jobs in jobs_by_chain.items():
+        client = get_chain_client(config_key, private_key)
+        tx_receipts = batch_calls(
+            partial(client.w3.eth.get_transaction_receipt, job["tx_hash"])
+            for job in chain_jobs
         )
-        self.init_class_selection(
-            self.search_frame,
-            "Select Sub Class",
-            self.sub_class_selections,
-            1,
-            is_main_class=False,
+        in_flight = []
+        for job, tx_receipt in zip(chain_jobs, tx_receipts):
+            try:
+                tx_receipt = tx_receipt.result()
+            except Exception:
+                in_flight.append(job)
+                continue
+            settle_journaled_job(job, tx_receipt, ui_update_function, on_bridged)
+
+        # In nonce order, so the lowest stuck transaction is found first
+        in_flight.sort(key=lambda job: job.get("nonce", 0))
+        in_flight = [
+            (
+                job,
+                JournaledTransaction(HexBytes(job["tx_hash"]), HexBytes(job["raw_tx"])),
+            )
+            for job in in_flight
+        ]
+        transactions = []
+        for job, signed_tx in in_flight:
+            transactions.append(
+                (
+                    signed_tx,
+                    client.receipt_tracker.track(signed_tx.hash, ui_update_function),
+                )
+            )
+            try:
+                client.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception:
+                pass
+        tx_receipts = wait_for_bridge_receipts(
+            client.w3,
+            client.receipt_tracker,
+            transactions,
+            CONFIG["bridge_tx_timeout_seconds"],
+            ui_update_function,
         )
-        self.init_summon_selection(self.search_frame)
-        self.init_generation_selection(self.search_frame)
-        self.init_rarity_selection(self.search_frame)
-        self.init_level_selection(self.search_frame)
-        self.init_realm_selection(self.search_frame)
-        self.init_profession_selection(self.search_frame)
-        self.init_password_entry(self.search_frame)
-        self.init_search_button(self.search_frame)
-        self.init_select_all_button(self.search_frame)
-        self.init_bridge_selected_button(self.search_frame)
-        self.init_results_area()
-        self.init_selected_heroes_area()
-
-    def init_results_area(self):
-        self.results_text = scrolledtext.ScrolledText(
-            self.results_frame, width=150, height=10, bg="black", fg="white"
+        for (job, signed_tx), tx_receipt in zip(in_flight, tx_receipts):
+            if tx_receipt is None:
+                bridge_journal.record(
+                    account_address, job["hero_id"], config_key, "dropped"
+                )
+                requeued.append(job)
+            else:
+                settle_journaled_job(job, tx_receipt, ui_update_function, on_bridged)
+    bridge_journal.sync()
+
+    arrivals = []
+    if requeued:
+        arrivals = bridge_heroes_pipelined(
+            [
+                (job["hero_id"], {"id": job["hero_id"], "network": job["network"]})
+                for job in requeued
+            ],
+            private_key,
+            ui_update_function,
+            on_bridged,
         )
-        self.results_text.pack(fill="both", expand=True)
-        self.results_text.config(state=tk.DISABLED)
+    return set(jobs), arrivals
 
-    def init_selected_heroes_area(self):
-        self.selected_heroes_frame = ttk.Frame(self.results_frame, style="TFrame")
-        self.selected_heroes_frame.pack(fill="both", expand=True)
 
-        self.selected_heroes_label = ttk.Label(
-            self.selected_heroes_frame, text="Selected Heroes", style="TLabel"
+def settle_journaled_job(job, tx_receipt, ui_update_function, on_bridged):
+    if tx_receipt["status"] == 0:
+        bridge_journal.record(job["account"], job["hero_id"], job["chain"], "reverted")
+        ui_update_function(
+            f"Failed to bridge hero {job['hero_id']}: transaction reverted."
         )
-        self.selected_heroes_label.pack(anchor="w", padx=5)
+    else:
+        bridge_journal.record(job["account"], job["hero_id"], job["chain"], "mined")
+        ui_update_function(f"Transaction for hero {job['hero_id']} mined!")
+        on_bridged(job["hero_id"])
 
-        self.selected_heroes_text = scrolledtext.ScrolledText(
-            self.selected_heroes_frame, width=150, height=5, bg="black", fg="white"
-        )
-        self.selected_heroes_text.pack(fill="both", expand=True)
-        self.selected_heroes_text.config(state=tk.DISABLED)
-
-    def log_to_ui(self, message):
-        self.master.after(0, lambda: self._log_to_ui(message))
-
-    def _log_to_ui(self, message):
-        self.results_text.config(state=tk.NORMAL)
-        self.results_text.insert(tk.END, f"{message}\n")
-        self.results_text.see(tk.END)
-        self.results_text.config(state=tk.DISABLED)
-
-    def async_log_to_ui(self, message):
-        threading.Thread(target=self.log_to_ui, args=(message,)).start()
-
-    def update_results_area(self, data):
-        if data["action"] == "remove":
-            del self.persistent_selected_heroes[data["hero_id"]]
-            self.update_selected_heroes_area()  # Refresh the list of selected heroes
-            self.results_text.insert(
-                tk.END, f"Hero ID {data['hero_id']} bridged successfully.\n"
-            )
 
-    def init_profession_selection(self, master):
-        ttk.Label(master, text="Select Profession:").grid(
-            row=13, column=0, columnspan=4, sticky="w", padx=5, pady=(10, 0)
+def preflight_chain_heroes(
+    client, heroes_items, destination_chain_id, bridge_fee_in_wei, ui_update_function
+):
+    # Simulates sendHero for every hero in one batched round of eth_calls, so
+    # a hero that is no longer owned, already bridged, on auction or otherwise
+    # locked is dropped before it costs gas, a nonce and a receipt timeout
+    simulations = batch_calls(
+        partial(
+            client.contract.functions.sendHero(int(hero_id), destination_chain_id).call,
+            {"from": client.account.address, "value": bridge_fee_in_wei},
         )
+        for hero_id, hero in heroes_items
+    )
+    eligible = []
+    for (hero_id, hero), simulation in zip(heroes_items, simulations):
+        try:
+            simulation.result()
+        except ContractLogicError as e:
+            ui_update_function(f"Skipping hero {hero_id}: {str(e)}")
+            continue
+        except Exception:
+            # Only a revert rules a hero out; an RPC hiccup is left for the
+            # send itself to report
+            pass
+        eligible.append((hero_id, hero))
+    ui_update_function(
+        f"Pre-flight: {len(eligible)} of {len(heroes_items)} heroes eligible."
+    )
+    return eligible
 
-        buttons_frame = ttk.Frame(master)
-        buttons_frame.grid(row=14, column=0, columnspan=4, sticky="ew", padx=5)
-
-        self.foraging_var = tk.IntVar(value=0)
-        self.fishing_var = tk.IntVar(value=0)
-        self.gardening_var = tk.IntVar(value=0)
-        self.mining_var = tk.IntVar(value=0)
-
-        self.foraging_button = tk.Button(
-            buttons_frame,
-            text="Foraging",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_profession_selection(
-                self.foraging_var, self.foraging_button
-            ),
-        )
-        self.foraging_button.grid(row=0, column=0, sticky="ew", padx=5)
-
-        self.fishing_button = tk.Button(
-            buttons_frame,
-            text="Fishing",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_profession_selection(
-                self.fishing_var, self.fishing_button
-            ),
-        )
-        self.fishing_button.grid(row=0, column=1, sticky="ew", padx=5)
-
-        self.gardening_button = tk.Button(
-            buttons_frame,
-            text="Gardening",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_profession_selection(
-                self.gardening_var, self.gardening_button
-            ),
-        )
-        self.gardening_button.grid(row=0, column=2, sticky="ew", padx=5)
-
-        self.mining_button = tk.Button(
-            buttons_frame,
-            text="Mining",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_profession_selection(
-                self.mining_var, self.mining_button
-            ),
+
+def bridge_chain_heroes(
+    config_key, heroes_items, private_key, ui_update_function, on_bridged
+):
+    _, destination_chain_id = bridge_route(heroes_items[0][1])
+    destination_config_key = next(
+        key
+        for key, chain_id in CONFIG["chain_ids"].items()
+        if chain_id == destination_chain_id
+    )
+    arrival_tracker = get_arrival_tracker(destination_config_key)
+    arrivals = []
+    bridge_fee_in_wei = Web3.to_wei(CONFIG["fees_in_gwei"][config_key], "ether")
+    tx_timeout_seconds = CONFIG["bridge_tx_timeout_seconds"]
+
+    client = get_chain_client(config_key, private_key)
+    w3 = client.w3
+    account = client.account
+    contract = client.contract
+    nonces = client.nonces
+    receipt_tracker = client.receipt_tracker
+    # Transactions may have been sent from elsewhere since the last run
+    nonces.resync()
+
+    if CONFIG["bridge_preflight"]:
+        eligible = preflight_chain_heroes(
+            client,
+            heroes_items,
+            destination_chain_id,
+            bridge_fee_in_wei,
+            ui_update_function,
         )
-        self.mining_button.grid(row=0, column=3, sticky="ew", padx=5)
-
-        buttons_frame.grid_columnconfigure(0, weight=1)
-        buttons_frame.grid_columnconfigure(1, weight=1)
-        buttons_frame.grid_columnconfigure(2, weight=1)
-        buttons_frame.grid_columnconfigure(3, weight=1)
-
-    def toggle_profession_selection(self, profession_var, button):
-        if profession_var.get() == 1:
-            profession_var.set(0)
-            button.config(
-                bg="black",
-                fg="white",
-                highlightbackground="white",
-                highlightthickness=2,
-            )
-        else:
-            profession_var.set(1)
-            button.config(
-                bg="green",
-                fg="white",
-                highlightbackground="white",
-                highlightthickness=2,
+        eligible_ids = {hero_id for hero_id, hero in eligible}
+        for hero_id, hero in heroes_items:
+            if hero_id not in eligible_ids:
+                bridge_journal.record(account.address, hero_id, config_key, "skipped")
+        heroes_items = eligible
+
+    # Sign and broadcast a window of heroes with consecutive nonces, then
+    # confirm the whole window, instead of waiting out each hero in turn
+    depth = max(1, CONFIG["bridge_pipeline_depth"])
+    pending_heroes = deque(heroes_items)
+    while pending_heroes:
+        window = [
+            pending_heroes.popleft() for _ in range(min(depth, len(pending_heroes)))
+        ]
+        signed = []
+        for hero_id, hero in window:
+            ui_update_function(f"Starting to bridge hero {hero_id}...")
+            try:
+                gas_limit = gas_limit_cache.gas_limit(
+                    client, int(hero_id), destination_chain_id, bridge_fee_in_wei
+                )
+                fees_in_wei = client.fee_oracle.current_fees()
+                nonce = nonces.allocate()
+                signed_tx = build_send_hero_transaction(
+                    account,
+                    contract.address,
+                    client.chain_id,
+                    int(hero_id),
+                    destination_chain_id,
+                    bridge_fee_in_wei,
+                    nonce,
+                    fees_in_wei,
+                    gas_limit,
+                )
+            except Exception as e:
+                # Nothing of this window is on chain yet, so the nonces already
+                # handed out stay valid and there is nothing to resync
+                ui_update_function(f"Error during bridging hero {hero_id}: {str(e)}")
+                bridge_journal.record(
+                    account.address, hero_id, config_key, "failed", error=str(e)
+                )
+                continue
+            bridge_journal.record(
+                account.address,
+                hero_id,
+                config_key,
+                "signed",
+                nonce=nonce,
+                tx_hash=Web3.to_hex(signed_tx.hash),
+                raw_tx=Web3.to_hex(signed_tx.rawTransaction),
             )
-
-    def init_realm_selection(self, master):
-        ttk.Label(master, text="Select Realm:").grid(
-            row=11, column=0, columnspan=4, sticky="w", padx=5, pady=(10, 0)
+            signed.append((hero_id, hero, signed_tx, gas_limit, nonce))
+        # The whole window is on disk before any of it is broadcast, so after a
+        # crash every transaction that may be on the wire can be found again
+        bridge_journal.sync()
+
+        # Each hash is watched from just before it is sent, so the tracker's
+        # look-back starts no later than the broadcast and a transaction mined
+        # while earlier ones are still being sent or waited on is not missed
+        sent = []
+        transactions = []
+        for index, (hero_id, hero, signed_tx, gas_limit, nonce) in enumerate(signed):
+            receipt = receipt_tracker.track(signed_tx.hash, ui_update_function)
+            try:
+                w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:
+                receipt_tracker.forget(signed_tx.hash)
+                ui_update_function(f"Error during bridging hero {hero_id}: {str(e)}")
+                bridge_journal.record(
+                    account.address, hero_id, config_key, "failed", error=str(e)
+                )
+                nonces.resync()
+                # The rest of the window was signed with nonces after this one
+                # and could never be mined, so it goes back to be signed again
+                retried = [(hero_id, hero) for hero_id, hero, *_ in signed[index + 1 :]]
+                for retry_hero_id, retry_hero in retried:
+                    bridge_journal.record(
+                        account.address,
+                        retry_hero_id,
+                        config_key,
+                        "queued",
+                        network=retry_hero["network"],
+                    )
+                pending_heroes.extendleft(reversed(retried))
+                break
+            bridge_journal.record(account.address, hero_id, config_key, "broadcast")
+            ui_update_function(f"Hero {hero_id} sent with nonce {nonce}.")
+            sent.append((hero_id, signed_tx, gas_limit, time.time()))
+            transactions.append((signed_tx, receipt))
+        bridge_journal.sync()
+
+        tx_receipts = wait_for_bridge_receipts(
+            w3,
+            receipt_tracker,
+            transactions,
+            tx_timeout_seconds,
+            ui_update_function,
         )
+        dropped = False
+        for (hero_id, signed_tx, gas_limit, sent_at), tx_receipt in zip(
+            sent, tx_receipts
+        ):
+            if tx_receipt is None:
+                ui_update_function(f"Failed to bridge hero {hero_id}: not mined.")
+                bridge_journal.record(account.address, hero_id, config_key, "dropped")
+                dropped = True
+            elif tx_receipt["status"] == 0:
+                # Mined but reverted: the nonce is used, the hero did not move
+                bridge_journal.record(account.address, hero_id, config_key, "reverted")
+                if tx_receipt["gasUsed"] >= gas_limit:
+                    gas_limit_cache.invalidate(client)
+                    ui_update_function(
+                        f"Failed to bridge hero {hero_id}: out of gas, gas limit will be re-estimated."
+                    )
+                else:
+                    ui_update_function(
+                        f"Failed to bridge hero {hero_id}: transaction reverted."
+                    )
+            else:
+                bridge_journal.record(account.address, hero_id, config_key, "mined")
+                ui_update_function(f"Transaction for hero {hero_id} mined!")
+                on_bridged(hero_id)
+                arrival = arrival_tracker.track(hero_id, sent_at, ui_update_function)
+                arrival.add_done_callback(
+                    partial(report_arrival, hero_id, ui_update_function)
+                )
+                arrivals.append((hero_id, arrival))
+        bridge_journal.sync()
+        if dropped:
+            nonces.resync()
 
-        buttons_frame = ttk.Frame(master)
-        buttons_frame.grid(row=12, column=0, columnspan=4, sticky="ew", padx=5)
-
-        self.cv_var = tk.IntVar(value=0)
-        self.sd_var = tk.IntVar(value=0)
-
-        self.cv_button = tk.Button(
-            buttons_frame,
-            text="Crystalvale",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_realm_selection(self.cv_var, self.cv_button),
-        )
-        self.cv_button.grid(row=0, column=0, sticky="ew", padx=5)
-
-        self.sd_button = tk.Button(
-            buttons_frame,
-            text="Serendale",
-            bg="black",
-            fg="white",
-            width=15,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=lambda: self.toggle_realm_selection(self.sd_var, self.sd_button),
-        )
-        self.sd_button.grid(row=0, column=1, sticky="ew", padx=5)
-
-        buttons_frame.grid_columnconfigure(0, weight=1)
-        buttons_frame.grid_columnconfigure(1, weight=1)
-
-    def toggle_realm_selection(self, realm_var, button):
-        if realm_var.get() == 1:
-            realm_var.set(0)
-            button.config(
-                bg="black",
-                fg="white",
-                highlightbackground="white",
-                highlightthickness=2,
-            )
-        else:
-            realm_var.set(1)
-            button.config(
-                bg="green",
-                fg="white",
-                highlightbackground="white",
-                highlightthickness=2,
-            )
+    return arrivals
 
-    def init_level_selection(self, master):
-        ttk.Label(master, text="Hero Level Range:").grid(
-            row=22, column=0, columnspan=3, sticky="w", padx=5
-        )
 
-        self.min_level_var = tk.IntVar(value=1)
-        ttk.Label(master, text="Min:").grid(row=23, column=0, sticky="w", padx=5)
-        self.min_level_scale = ttk.Scale(
-            master,
-            from_=1,
-            to=20,
-            orient="horizontal",
-            variable=self.min_level_var,
-            command=self.update_level_min_label,
+def report_arrival(hero_id, ui_update_function, arrival):
+    latency = arrival.result()
+    if latency is None:
+        ui_update_function(
+            f"Hero {hero_id} not seen arriving within {CONFIG['arrival_timeout_seconds']}s."
         )
-        self.min_level_scale.grid(row=23, column=1, sticky="ew", padx=5)
-        self.min_level_label = ttk.Label(master, textvariable=self.min_level_var)
-        self.min_level_label.grid(row=23, column=2, sticky="w", padx=5)
-
-        self.max_level_var = tk.IntVar(value=20)
-        ttk.Label(master, text="Max:").grid(row=24, column=0, sticky="w", padx=5)
-        self.max_level_scale = ttk.Scale(
-            master,
-            from_=1,
-            to=20,
-            orient="horizontal",
-            variable=self.max_level_var,
-            command=self.update_level_max_label,
+    else:
+        ui_update_function(f"Hero {hero_id} arrived after {latency}s.")
+
+
+def bridge_heroes_pipelined(heroes_items, private_key, ui_update_function, on_bridged):
+    account_address = w3_serendale2.eth.account.from_key(private_key).address
+    heroes_by_chain = {}
+    for hero_id, hero in heroes_items:
+        config_key, _ = bridge_route(hero)
+        if config_key is None:
+            ui_update_function(
+                f"Error during bridging hero {hero_id}: unsupported realm {hero['network']}"
+            )
+            continue
+        bridge_journal.record(
+            account_address, hero_id, config_key, "queued", network=hero["network"]
         )
-        self.max_level_scale.grid(row=24, column=1, sticky="ew", padx=5)
-        self.max_level_label = ttk.Label(master, textvariable=self.max_level_var)
-        self.max_level_label.grid(row=24, column=2, sticky="w", padx=5)
+        heroes_by_chain.setdefault(config_key, []).append((hero_id, hero))
+    bridge_journal.sync()
+
+    # Each origin chain is an independent lane with its own nonce sequence and
+    # confirmations, so a mixed batch takes as long as its slowest lane
+    with ThreadPoolExecutor(max_workers=max(1, len(heroes_by_chain))) as executor:
+        lanes = [
+            executor.submit(
+                run_bridge_lane,
+                config_key,
+                chain_heroes_items,
+                private_key,
+                ui_update_function,
+                on_bridged,
+            )
+            for config_key, chain_heroes_items in heroes_by_chain.items()
+        ]
 
-    def update_level_min_label(self, event=None):
-        self.min_level_var.set(int(self.min_level_scale.get()))
+    # Arrival futures for every mined hero, for callers that want to wait
+    # until the heroes have landed
+    return [arrival for lane in lanes for arrival in lane.result()]
 
-    def update_level_max_label(self, event=None):
-        self.max_level_var.set(int(self.max_level_scale.get()))
 
-    def init_generation_selection(self, master):
-        ttk.Label(master, text="Generation Range:").grid(
-            row=19, column=0, columnspan=3, sticky="w", padx=5, pady=0
-        )
+def run_bridge_lane(
+    config_key, heroes_items, private_key, ui_update_function, on_bridged
+):
+    def lane_log(message):
+        ui_update_function(f"[{config_key}] {message}")
 
-        self.min_generation_var = tk.IntVar(value=0)
-        ttk.Label(master, text="Min:").grid(
-            row=20, column=0, sticky="w", padx=5, pady=0
-        )
-        self.min_generation_scale = ttk.Scale(
-            master,
-            from_=0,
-            to=69,
-            orient="horizontal",
-            variable=self.min_generation_var,
-            command=self.update_generation_min_label,
-        )
-        self.min_generation_scale.grid(row=20, column=1, sticky="ew", padx=5, pady=0)
-        self.min_generation_label = ttk.Label(
-            master, textvariable=self.min_generation_var
-        )
-        self.min_generation_label.grid(row=20, column=2, sticky="w", padx=5, pady=0)
+    bridged = []
 
-        self.max_generation_var = tk.IntVar(value=69)
-        ttk.Label(master, text="Max:").grid(
-            row=21, column=0, sticky="w", padx=5, pady=0
-        )
-        self.max_generation_scale = ttk.Scale(
-            master,
-            from_=0,
-            to=69,
-            orient="horizontal",
-            variable=self.max_generation_var,
-            command=self.update_generation_max_label,
-        )
-        self.max_generation_scale.grid(row=21, column=1, sticky="ew", padx=5, pady=0)
-        self.max_generation_label = ttk.Label(
-            master, textvariable=self.max_generation_var
-        )
-        self.max_generation_label.grid(row=21, column=2, sticky="w", padx=5, pady=0)
+    def lane_bridged(hero_id):
+        bridged.append(hero_id)
+        lane_log(f"{len(bridged)}/{len(heroes_items)} heroes bridged.")
+        on_bridged(hero_id)
 
-    def init_class_selection(
-        self, master, label_text, selection_set, offset, is_main_class=True
-    ):
-        ttk.Label(master, text=label_text).grid(
-            row=offset * 6, column=0, columnspan=4, sticky="w"
+    arrivals = []
+    try:
+        arrivals = bridge_chain_heroes(
+            config_key, heroes_items, private_key, lane_log, lane_bridged
         )
+    except Exception as e:
+        lane_log(f"Error during bridging: {str(e)}")
+    lane_log(f"Lane finished: {len(bridged)} of {len(heroes_items)} heroes bridged.")
+    return arrivals
+
+
+HEROES_QUERY_FIELDS = """
+        id
+        mainClass
+        subClass
+        summonsRemaining
+        passive1
+        passive2
+        active1
+        active2
+        generation
+        rarity
+        level
+        network
+        professionStr
+"""
+
+HEROES_QUERY_VARIABLES = "$account_address: String!, $first: Int!, $min_summons: Int, $max_summons: Int, $main_classes: [Int], $sub_classes: [Int], $max_generation: Int, $min_generation: Int, $max_rarity: Int, $min_rarity: Int, $min_level: Int, $max_level: Int, $networks: [String], $professions: [String]"
+
+HEROES_QUERY_WHERE = "owner: $account_address, summonsRemaining_gte: $min_summons, summonsRemaining_lte: $max_summons, mainClass_in: $main_classes, subClass_in: $sub_classes, generation_lte: $max_generation, generation_gte: $min_generation, rarity_lte: $max_rarity, rarity_gte: $min_rarity, level_gte: $min_level, level_lte: $max_level, network_in: $networks, professionStr_in: $professions"
+
+HEROES_QUERY = f"""
+query getHeroes({HEROES_QUERY_VARIABLES}, $skip_number: Int!){{
+    heroes(first: $first, skip: $skip_number, orderBy: id, orderDirection: desc, where: {{{HEROES_QUERY_WHERE}}}) {{{HEROES_QUERY_FIELDS}    }}
+}}
+"""
+
+# Keyset variant: every page after the first filters on the last id seen
+# instead of skipping, so page cost stays flat however deep the scan goes.
+HEROES_KEYSET_QUERY = f"""
+query getHeroes({HEROES_QUERY_VARIABLES}, $last_id: ID!){{
+    heroes(first: $first, orderBy: id, orderDirection: desc, where: {{{HEROES_QUERY_WHERE}, id_lt: $last_id}}) {{{HEROES_QUERY_FIELDS}    }}
+}}
+"""
+
+
+HERO_FIELDS = tuple(HEROES_QUERY_FIELDS.split())
+
+# Only the fields that can change while a hero stays in the account; everything
+# else is fixed by the hero's genes and never needs fetching twice.
+HERO_FINGERPRINT_FIELDS = ("network", "level", "summonsRemaining")
+
+HERO_FINGERPRINT_QUERY = """
+query getHeroFingerprints($account_address: String!, $first: Int!){
+    heroes(first: $first, orderBy: id, orderDirection: desc, where: {owner: $account_address}) {
+        id
+        network
+        level
+        summonsRemaining
+    }
+}
+"""
+
+HERO_FINGERPRINT_KEYSET_QUERY = """
+query getHeroFingerprints($account_address: String!, $first: Int!, $last_id: ID!){
+    heroes(first: $first, orderBy: id, orderDirection: desc, where: {owner: $account_address, id_lt: $last_id}) {
+        id
+        network
+        level
+        summonsRemaining
+    }
+}
+"""
 
-        buttons_frame = ttk.Frame(master)
-        buttons_frame.grid(row=1 + offset * 6, column=0, columnspan=4, sticky="ew")
-
-        class_buttons = {}
-
-        for index, (class_number, class_name) in enumerate(self.class_names.items()):
-            btn = tk.Button(
-                buttons_frame,
-                text=f"{class_name}",
-                bg="black",
-                fg="white",
-                width=15,
-                highlightbackground="white",
-                highlightcolor="white",
-                highlightthickness=2,
-                bd=5,
-                command=lambda cn=class_number, s=selection_set: self.toggle_class_selection(
-                    cn, s, class_buttons
-                ),
-            )
-            btn.grid(
-                row=(index // 4 + 1), column=index % 4, sticky="ew", padx=5, pady=2
-            )
-            class_buttons[class_number] = btn
-
-        tk.Button(
-            buttons_frame,
-            text="All",
-            command=lambda: self.select_classes(
-                class_buttons, selection_set, list(self.class_names.keys())
-            ),
-        ).grid(row=0, column=0, sticky="ew", padx=5)
-        tk.Button(
-            buttons_frame,
-            text="Basic",
-            command=lambda: self.select_classes(
-                class_buttons, selection_set, list(range(0, 12))
-            ),
-        ).grid(row=0, column=1, sticky="ew", padx=5)
-        tk.Button(
-            buttons_frame,
-            text="Advanced",
-            command=lambda: self.select_classes(
-                class_buttons, selection_set, list(range(16, 22))
-            ),
-        ).grid(row=0, column=2, sticky="ew", padx=5)
-        tk.Button(
-            buttons_frame,
-            text="Elite",
-            command=lambda: self.select_classes(
-                class_buttons, selection_set, list(range(24, 27))
-            ),
-        ).grid(row=0, column=3, sticky="ew", padx=5)
-
-        buttons_frame.grid_columnconfigure(tuple(range(4)), weight=1)
-
-    def init_summon_selection(self, master):
-        ttk.Label(master, text="Summons Range:").grid(
-            row=16, column=0, columnspan=3, sticky="w", padx=5
-        )
+HEROES_BY_ID_QUERY = f"""
+query getHeroesById($ids: [ID], $first: Int!){{
+    heroes(first: $first, where: {{id_in: $ids}}) {{{HEROES_QUERY_FIELDS}    }}
+}}
+"""
 
-        self.min_summon_var = tk.IntVar(value=0)
-        ttk.Label(master, text="Min:").grid(row=17, column=0, sticky="w", padx=5)
-        self.min_summon_scale = ttk.Scale(
-            master,
-            from_=0,
-            to_=11,
-            orient="horizontal",
-            variable=self.min_summon_var,
-            command=self.update_summon_min_label,
-        )
-        self.min_summon_scale.grid(row=17, column=1, sticky="ew", padx=5)
-        self.min_summon_label = ttk.Label(master, textvariable=self.min_summon_var)
-        self.min_summon_label.grid(row=17, column=2, sticky="w", padx=5)
-
-        self.max_summon_var = tk.IntVar(value=11)
-        ttk.Label(master, text="Max:").grid(row=18, column=0, sticky="w", padx=5)
-        self.max_summon_label = ttk.Label(master, textvariable=self.max_summon_var)
-        self.max_summon_label.grid(row=18, column=2, sticky="w", padx=5)
-        self.max_summon_scale = ttk.Scale(
-            master,
-            from_=0,
-            to_=11,
-            orient="horizontal",
-            variable=self.max_summon_var,
-            command=self.update_summon_max_label,
-        )
-        self.max_summon_scale.grid(row=18, column=1, sticky="ew", padx=5)
 
-    def init_password_entry(self, master):
-        self.password_label = ttk.Label(
-            self.search_frame, text="Password:", style="TLabel"
+def fetch_hero_page(variables, skip_number, ui_update_function, last_id=None):
+    if last_id is None:
+        query = HEROES_QUERY
+        page_variables = dict(
+            variables, first=CONFIG["search_page_size"], skip_number=skip_number
         )
-        self.password_label.grid(row=16, column=3, sticky="w", padx=5)
-        self.password_entry = ttk.Entry(self.search_frame, show="*")
-        self.password_entry.grid(row=17, column=3, sticky="ew", padx=5)
-
-    def init_search_button(self, master):
-        self.search_button = tk.Button(
-            self.search_frame,
-            text="Search",
-            bg="green",
-            fg="white",
-            width=20,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=self.perform_search,
-        )
-        self.search_button.grid(row=18, column=3, rowspan=2, sticky="ew", padx=5)
-
-    def init_select_all_button(self, master):
-        self.select_all_button = tk.Button(
-            self.search_frame,
-            text="Select All",
-            bg="blue",
-            fg="white",
-            width=20,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=self.select_all_heroes,
-        )
-        self.select_all_button.grid(row=20, column=3, rowspan=2, sticky="ew", padx=5)
-
-    def init_bridge_selected_button(self, master):
-        self.bridge_selected_button = tk.Button(
-            self.search_frame,
-            text="Bridge Selected",
-            bg="red",
-            fg="white",
-            width=20,
-            highlightbackground="white",
-            highlightcolor="white",
-            highlightthickness=2,
-            bd=5,
-            command=self.bridge_heroes,
-        )
-        self.bridge_selected_button.grid(
-            row=22, column=3, rowspan=2, sticky="ew", padx=5
+    else:
+        query = HEROES_KEYSET_QUERY
+        page_variables = dict(
+            variables, first=CONFIG["search_page_size"], last_id=last_id
         )
+    return post_graphql(query, page_variables, ui_update_function)
 
-    def init_rarity_selection(self, master):
-        self.min_rarity_var = tk.IntVar(value=0)
-        self.max_rarity_var = tk.IntVar(value=4)
 
-        ttk.Label(master, text="Rarity Range:").grid(
-            row=25, column=0, columnspan=3, sticky="w", padx=5
-        )
+graphql_session = None
+graphql_session_lock = threading.Lock()
 
-        self.min_rarity_name = tk.StringVar(value="common")
-        self.max_rarity_name = tk.StringVar(value="mythic")
 
-        ttk.Label(master, text="Min:").grid(row=26, column=0, sticky="w", padx=5)
-        self.min_rarity_label = ttk.Label(
-            master, textvariable=self.min_rarity_name, width=10
-        )
-        self.min_rarity_label.grid(row=26, column=2, sticky="ew")
-
-        self.min_rarity_scale = ttk.Scale(
-            master,
-            from_=0,
-            to=4,
-            orient="horizontal",
-            variable=self.min_rarity_var,
-            command=lambda e: self.update_rarity_labels(),
-        )
-        self.min_rarity_scale.grid(row=26, column=1, sticky="ew", padx=5)
+def get_graphql_session():
+    # One keep-alive session for the whole app, with a pool large enough for
+    # every concurrent page window, so pages after the first skip TCP/TLS setup
+    global graphql_session
+    with graphql_session_lock:
+        if graphql_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=max(1, CONFIG["search_concurrency"])
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # urllib3 only advertises br when it can decode it
+            session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)[
+                "accept-encoding"
+            ]
+            graphql_session = session
+        return graphql_session
 
-        ttk.Label(master, text="Max:").grid(row=27, column=0, sticky="w", padx=5)
-        self.max_rarity_label = ttk.Label(
-            master, textvariable=self.max_rarity_name, width=10
-        )
-        self.max_rarity_label.grid(row=27, column=2, sticky="ew")
-
-        self.max_rarity_scale = ttk.Scale(
-            master,
-            from_=0,
-            to=4,
-            orient="horizontal",
-            variable=self.max_rarity_var,
-            command=lambda e: self.update_rarity_labels(),
-        )
-        self.max_rarity_scale.grid(row=27, column=1, sticky="ew", padx=5)
-
-        master.grid_columnconfigure(1, weight=1)
-        master.grid_columnconfigure(2, weight=1)
-
-    def update_rarity_labels(self):
-        rarity_map = {
-            0: "common",
-            1: "uncommon",
-            2: "rare",
-            3: "legendary",
-            4: "mythic",
-        }
-        self.min_rarity_name.set(f"{rarity_map[self.min_rarity_var.get()]:<10}")
-        self.max_rarity_name.set(f"{rarity_map[self.max_rarity_var.get()]:<10}")
 
-    def update_summon_min_label(self, event=None):
-        self.min_summon_var.set(int(self.min_summon_scale.get()))
+GRAPHQL_RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 
-    def update_summon_max_label(self, event=None):
-        self.max_summon_var.set(int(self.max_summon_scale.get()))
+HeroSearchResult = namedtuple("HeroSearchResult", ["heroes", "complete", "cursor"])
 
-    def update_generation_min_label(self, event=None):
-        self.min_generation_var.set(int(self.min_generation_scale.get()))
 
-    def update_generation_max_label(self, event=None):
-        self.max_generation_var.set(int(self.max_generation_scale.get()))
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0), CONFIG["graphql_backoff_max_seconds"])
+
+
+def backoff_delay(attempt):
+    # Full jitter, so concurrent page windows that failed together spread out
+    return random.uniform(
+        0,
+        min(
+            CONFIG["graphql_backoff_max_seconds"],
+            CONFIG["graphql_backoff_seconds"] * 2**attempt,
+        ),
+    )
 
-    def update_selected_heroes_area(self):
-        self.selected_heroes_text.config(state=tk.NORMAL)
-        self.selected_heroes_text.delete(1.0, tk.END)
 
-        for hero in self.persistent_selected_heroes.values():
-            (
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-            ) = self.construct_detailed_info(hero)
-            self.insert_hero_info_and_abilities_inline(
-                self.selected_heroes_text,
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-                None,
+def post_graphql(query, variables, ui_update_function):
+    retries = CONFIG["graphql_retries"]
+    for attempt in range(retries + 1):
+        retryable = True
+        retry_after = None
+        try:
+            response = get_graphql_session().post(
+                CONFIG["graphql_url"],
+                json={"query": query, "variables": variables},
+                timeout=CONFIG["graphql_timeout_seconds"],
             )
+        except requests.RequestException as e:
+            error = f"Failed to fetch heroes: {e}"
+        else:
+            if response.status_code == 200:
+                try:
+                    json_data = response.json()
+                except ValueError:
+                    json_data = {}
+                if json_data.get("data") and "heroes" in json_data["data"]:
+                    return json_data["data"]["heroes"]
+                error = f"No data found in response: {json_data}"
+            else:
+                error = f"Failed to fetch heroes, Status Code: {response.status_code}, Response: {response.text}"
+                retryable = response.status_code in GRAPHQL_RETRYABLE_STATUS_CODES
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
 
-        self.selected_heroes_text.config(state=tk.DISABLED)
+        if not retryable or attempt == retries:
+            ui_update_function(error)
+            return None
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        ui_update_function(f"{error} Retrying in {delay:.1f}s...")
+        time.sleep(delay)
 
-    def toggle_class_selection(self, class_number, selection_set, class_buttons):
-        if class_number in selection_set:
-            selection_set.remove(class_number)
-        else:
-            selection_set.add(class_number)
-        bg_color = "green" if class_number in selection_set else "black"
-        class_buttons[class_number].config(
-            bg=bg_color, fg="white", highlightbackground="white", highlightthickness=2
+
+def fetch_heroes_keyset(
+    variables, ui_update_function, last_id=None, on_page=None, cancel_event=None
+):
+    page_size = CONFIG["search_page_size"]
+    all_heroes = []
+    while not (cancel_event and cancel_event.is_set()):
+        current_heroes = fetch_hero_page(variables, 0, ui_update_function, last_id)
+        if current_heroes is None:
+            break
+        all_heroes.extend(current_heroes)
+        if on_page:
+            on_page(current_heroes)
+        if len(current_heroes) < page_size:
+            return HeroSearchResult(all_heroes, True, None)
+        last_id = current_heroes[-1]["id"]
+    return HeroSearchResult(all_heroes, False, last_id)
+
+
+def fetch_hero_fingerprints(account_address, ui_update_function):
+    page_size = CONFIG["search_page_size"]
+    fingerprints = []
+    query = HERO_FINGERPRINT_QUERY
+    variables = {"account_address": account_address, "first": page_size}
+    while True:
+        current_heroes = post_graphql(query, variables, ui_update_function)
+        if current_heroes is None:
+            return None
+        fingerprints.extend(current_heroes)
+        if len(current_heroes) < page_size:
+            return fingerprints
+        query = HERO_FINGERPRINT_KEYSET_QUERY
+        variables = dict(variables, last_id=current_heroes[-1]["id"])
+
+
+def fetch_heroes_by_id(hero_ids, ui_update_function):
+    page_size = CONFIG["search_page_size"]
+    heroes = []
+    for start in range(0, len(hero_ids), page_size):
+        current_heroes = post_graphql(
+            HEROES_BY_ID_QUERY,
+            {"ids": hero_ids[start : start + page_size], "first": page_size},
+            ui_update_function,
         )
+        if current_heroes is None:
+            return None
+        heroes.extend(current_heroes)
+    return heroes
+
 
-    def select_classes(self, class_buttons, selection_set, class_range):
-        all_selected = all(
-            class_number in selection_set for class_number in class_range
+def fetch_heroes(
+    variables,
+    concurrency,
+    ui_update_function,
+    pagination="skip",
+    resume_from=None,
+    on_page=None,
+    cancel_event=None,
+):
+    # resume_from is the cursor of an incomplete HeroSearchResult, so a failed
+    # sweep can carry on from its last good page instead of starting over.
+    # on_page is called with each page in `id desc` order as soon as it can
+    # be placed, and setting cancel_event stops any further pages.
+    if pagination == "keyset":
+        return fetch_heroes_keyset(
+            variables, ui_update_function, resume_from, on_page, cancel_event
         )
-        for class_number in class_range:
-            if class_number in class_buttons:
-                if all_selected:
-                    selection_set.remove(class_number)
-                    class_buttons[class_number].config(
-                        bg="black",
-                        fg="white",
-                        highlightbackground="white",
-                        highlightthickness=2,
-                    )
+
+    # Keep up to `concurrency` skip windows in flight. Once a short (or failed)
+    # page comes back there is nothing beyond it, so no further windows are
+    # launched and pages are merged back in skip order, i.e. `id desc`.
+    page_size = CONFIG["search_page_size"]
+    concurrency = max(1, int(concurrency))
+    pages = {}
+    last_skip = None
+    merge_skip = next_skip = resume_from or 0
+    in_flight = {}
+    all_heroes = []
+    complete = False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            while (
+                len(in_flight) < concurrency
+                and (last_skip is None or next_skip <= last_skip)
+                and not (cancel_event and cancel_event.is_set())
+            ):
+                future = executor.submit(
+                    fetch_hero_page, variables, next_skip, ui_update_function
+                )
+                in_flight[future] = next_skip
+                next_skip += page_size
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                skip_number = in_flight.pop(future)
+                current_heroes = future.result()
+                pages[skip_number] = current_heroes
+                if current_heroes is None or len(current_heroes) < page_size:
+                    if last_skip is None or skip_number < last_skip:
+                        last_skip = skip_number
+
+            while not complete and pages.get(merge_skip) is not None:
+                current_heroes = pages.pop(merge_skip)
+                all_heroes.extend(current_heroes)
+                if on_page:
+                    on_page(current_heroes)
+                if merge_skip == last_skip:
+                    complete = True
                 else:
-                    selection_set.add(class_number)
-                    class_buttons[class_number].config(
-                        bg="green",
-                        fg="white",
-                        highlightbackground="white",
-                        highlightthickness=2,
-                    )
+                    merge_skip += page_size
+
+    if complete:
+        return HeroSearchResult(all_heroes, True, None)
+    return HeroSearchResult(all_heroes, False, merge_skip)
 
-    def search_heroes(
+
+def parse_class_input(user_input):
+    user_input = ", ".join(str(item) for item in user_input)
+    if user_input.strip().lower() == "none":
+        return None
+    main_classes = []
+    input_parts = user_input.replace(" ", "").split(",")
+    for part in input_parts:
+        if "-" in part:
+            start, end = part.split("-")
+            main_classes.extend(range(int(start), int(end) + 1))
+        elif part.startswith("[") and part.endswith("]"):
+            class_list = part[1:-1].split(";")
+            main_classes.extend([int(cls) for cls in class_list])
+        else:
+            main_classes.append(int(part))
+    return main_classes
+
+
+def build_search_variables(
+    account_address,
+    main_class=None,
+    sub_class=None,
+    min_summon=None,
+    max_summon=None,
+    min_gen=None,
+    max_gen=None,
+    min_rarity=None,
+    max_rarity=None,
+    min_level=None,
+    max_level=None,
+    cv=None,
+    sd=None,
+    foraging=None,
+    fishing=None,
+    gardening=None,
+    mining=None,
+):
+    main_classes = parse_class_input(main_class) if main_class else []
+    sub_classes = parse_class_input(sub_class) if sub_class else []
+
+    min_summons = int(min_summon) if min_summon is not None else 0
+    max_summons = int(max_summon) if max_summon is not None else 999
+
+    min_generation = int(min_gen) if min_gen is not None else 0
+    max_generation = int(max_gen) if max_gen is not None else 999
+
+    min_rarity = int(min_rarity) if min_rarity is not None else 0
+    max_rarity = int(max_rarity) if max_rarity is not None else 4
+
+    min_level = int(min_level) if min_level is not None else 0
+    max_level = int(max_level) if max_level is not None else 20
+
+    networks = []
+    if cv:
+        networks.append("dfk")
+    if sd:
+        networks.append("kla")
+
+    professions = []
+    if foraging:
+        professions.append("foraging")
+    if fishing:
+        professions.append("fishing")
+    if gardening:
+        professions.append("gardening")
+    if mining:
+        professions.append("mining")
+
+    return {
+        "account_address": account_address,
+        "min_summons": min_summons,
+        "max_summons": max_summons,
+        "main_classes": main_classes or [],
+        "sub_classes": sub_classes or [],
+        "max_generation": max_generation,
+        "min_generation": min_generation,
+        "max_rarity": max_rarity,
+        "min_rarity": min_rarity,
+        "min_level": min_level,
+        "max_level": max_level,
+        "networks": networks,
+        "professions": professions,
+    }
+
+
+HERO_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS heroes (
+    account TEXT NOT NULL,
+    id TEXT NOT NULL,
+    id_num INTEGER NOT NULL,
+    mainClass INTEGER,
+    subClass INTEGER,
+    summonsRemaining INTEGER,
+    passive1 INTEGER,
+    passive2 INTEGER,
+    active1 INTEGER,
+    active2 INTEGER,
+    generation INTEGER,
+    rarity INTEGER,
+    level INTEGER,
+    network TEXT,
+    professionStr TEXT,
+    PRIMARY KEY (account, id)
+);
+CREATE INDEX IF NOT EXISTS heroes_by_account ON heroes (account, id_num DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_cursor (
+    account TEXT PRIMARY KEY,
+    pagination TEXT NOT NULL,
+    cursor TEXT NOT NULL,
+    boundary_id_num INTEGER NOT NULL
+);
+"""
+
+
+class HeroIndex:
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(HERO_INDEX_SCHEMA)
+
+    def last_synced(self, account_address):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT synced_at FROM sync_state WHERE account = ?",
+                (account_address.lower(),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def insert_heroes(self, account, heroes):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO heroes (account, id_num, {', '.join(HERO_FIELDS)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in HERO_FIELDS)})",
+                [
+                    (account, int(hero["id"]))
+                    + tuple(hero.get(field) for field in HERO_FIELDS)
+                    for hero in heroes
+                ],
+            )
+
+    def sync(
         self,
         account_address,
-        main_class,
-        sub_class,
-        min_summon,
-        max_summon,
-        min_gen,
-        max_gen,
-        min_rarity,
-        max_rarity,
-        min_level,
-        max_level,
-        cv,
-        sd,
-        foraging,
-        fishing,
-        gardening,
-        mining,
+        ui_update_function,
+        force=False,
+        on_page=None,
+        cancel_event=None,
+        on_resume=None,
     ):
-        main_classes = parse_class_input(main_class) if main_class else []
-        sub_classes = parse_class_input(sub_class) if sub_class else []
-
-        min_summons = int(min_summon) if min_summon is not None else 0
-        max_summons = int(max_summon) if max_summon is not None else 999
-
-        min_generation = int(min_gen) if min_gen is not None else 0
-        max_generation = int(max_gen) if max_gen is not None else 999
-
-        min_rarity = int(min_rarity) if min_rarity is not None else 0
-        max_rarity = int(max_rarity) if max_rarity is not None else 4
-
-        min_level = int(min_level) if min_level is not None else 0
-        max_level = int(max_level) if max_level is not None else 20
-
-        networks = []
-        if cv:
-            networks.append("dfk")
-        if sd:
-            networks.append("kla")
-
-        professions = []
-        if foraging:
-            professions.append("foraging")
-        if fishing:
-            professions.append("fishing")
-        if gardening:
-            professions.append("gardening")
-        if mining:
-            professions.append("mining")
-
-        all_heroes = []
-        continue_search = True
-        skip_number = 0
-        while continue_search:
-            url = "https://api.defikingdoms.com/graphql"
-            query = """
-            query getHeroes($account_address: String!, $skip_number: Int!, $min_summons: Int, $max_summons: Int, $main_classes: [Int], $sub_classes: [Int], $max_generation: Int, $min_generation: Int, $max_rarity: Int, $min_rarity: Int, $min_level: Int, $max_level: Int, $networks: [String], $professions: [String]){
-                heroes(first: 250, skip: $skip_number, orderBy: id, orderDirection: desc, where: {owner: $account_address, summonsRemaining_gte: $min_summons, summonsRemaining_lte: $max_summons, mainClass_in: $main_classes, subClass_in: $sub_classes, generation_lte: $max_generation, generation_gte: $min_generation, rarity_lte: $max_rarity, rarity_gte: $min_rarity, level_gte: $min_level, level_lte: $max_level, network_in: $networks, professionStr_in: $professions}) {
-                    id
-                    mainClass
-                    subClass
-                    summonsRemaining
-                    passive1
-                    passive2
-                    active1
-                    active2
-                    generation
-                    rarity
-                    level
-                    network
-                    professionStr
-                }
-            }
-            """
-            variables = {
-                "account_address": account_address,
-                "skip_number": skip_number,
-                "min_summons": min_summons,
-                "max_summons": max_summons,
-                "main_classes": main_classes or [],
-                "sub_classes": sub_classes or [],
-                "max_generation": max_generation,
-                "min_generation": min_generation,
-                "max_rarity": max_rarity,
-                "min_rarity": min_rarity,
-                "min_level": min_level,
-                "max_level": max_level,
-                "networks": networks,
-                "professions": professions,
-            }
-            response = requests.post(url, json={"query": query, "variables": variables})
-            if response.status_code == 200:
-                json_data = response.json()
-                if "data" in json_data and "heroes" in json_data["data"]:
-                    current_heroes = json_data["data"]["heroes"]
-                    all_heroes.extend(current_heroes)
-                    if len(current_heroes) < 250:
-                        continue_search = False
-                    else:
-                        skip_number += 250
-                else:
-                    self.async_log_to_ui(f"No data found in response: {json_data}")
-                    continue_search = False
-            else:
-                self.async_log_to_ui(
-                    f"Failed to fetch heroes, Status Code: {response.status_code}, Response: {response.text}"
-                )
-                continue_search = False
+        account = account_address.lower()
+        synced_at = self.last_synced(account)
+        if (
+            not force
+            and synced_at is not None
+            and time.time() - synced_at < CONFIG["hero_index_max_age"]
+        ):
+            return True
+        if force or synced_at is None:
+            return self.full_sync(
+                account_address,
+                ui_update_function,
+                on_page,
+                cancel_event,
+                resume=not force,
+                on_resume=on_resume,
+            )
 
-        return all_heroes
+        fingerprints = fetch_hero_fingerprints(account_address, ui_update_function)
+        if fingerprints is None or (cancel_event and cancel_event.is_set()):
+            return False
 
-    def perform_search(self):
-        password = self.password_entry.get()
-        script_dir = os.getcwd()
-        key_file_name = next(
-            (f for f in os.listdir(script_dir) if f.endswith(".key")), None
-        )
-        private_key = self.decrypt_key(
-            os.path.join(script_dir, key_file_name), password
+        with self.lock:
+            stored = {
+                row[0]: tuple(row[1:])
+                for row in self.connection.execute(
+                    "SELECT id, network, level, summonsRemaining FROM heroes WHERE account = ?",
+                    (account,),
+                )
+            }
+        seen_ids = {fingerprint["id"] for fingerprint in fingerprints}
+        removed_ids = [hero_id for hero_id in stored if hero_id not in seen_ids]
+        new_ids = [f["id"] for f in fingerprints if f["id"] not in stored]
+        changed = [
+            f
+            for f in fingerprints
+            if f["id"] in stored
+            and stored[f["id"]] != tuple(f[field] for field in HERO_FINGERPRINT_FIELDS)
+        ]
+        new_heroes = fetch_heroes_by_id(new_ids, ui_update_function)
+        if new_heroes is None:
+            return False
+
+        self.insert_heroes(account, new_heroes)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM heroes WHERE account = ? AND id = ?",
+                [(account, hero_id) for hero_id in removed_ids],
+            )
+            self.connection.executemany(
+                "UPDATE heroes SET network = ?, level = ?, summonsRemaining = ? WHERE account = ? AND id = ?",
+                [
+                    tuple(f[field] for field in HERO_FINGERPRINT_FIELDS)
+                    + (account, f["id"])
+                    for f in changed
+                ],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (account, synced_at) VALUES (?, ?)",
+                (account, time.time()),
+            )
+
+        ui_update_function(
+            f"Hero index synced: {len(new_heroes)} new, {len(changed)} updated, {len(removed_ids)} removed."
         )
-        if not private_key:
-            self.async_log_to_ui("Failed to decrypt private key.")
-            return
+        return True
 
-        account_address = w3_serendale2.eth.account.from_key(private_key).address
-        all_heroes = self.search_heroes(
-            account_address,
-            self.main_class_selections,
-            self.sub_class_selections,
-            self.min_summon_var.get(),
-            self.max_summon_var.get(),
-            self.min_generation_var.get(),
-            self.max_generation_var.get(),
-            self.min_rarity_var.get(),
-            self.max_rarity_var.get(),
-            self.min_level_var.get(),
-            self.max_level_var.get(),
-            self.cv_var.get(),
-            self.sd_var.get(),
-            self.foraging_var.get(),
-            self.fishing_var.get(),
-            self.gardening_var.get(),
-            self.mining_var.get(),
+    def full_sync(
+        self,
+        account_address,
+        ui_update_function,
+        on_page=None,
+        cancel_event=None,
+        resume=True,
+        on_resume=None,
+    ):
+        # Pages through the full hero query, storing and handing on each page
+        # as it lands, so a first sync can be shown while it is still running.
+        # A sweep that stops early leaves its cursor behind and the next one
+        # carries on from there instead of starting over; on_resume is called
+        # when it does, since its pages then only cover heroes below the cursor.
+        account = account_address.lower()
+        pagination = CONFIG["search_pagination"]
+
+        def store_page(heroes):
+            self.insert_heroes(account, heroes)
+            if on_page:
+                on_page(heroes)
+
+        resume_from = None
+        boundary_id_num = None
+        with self.lock:
+            cursor_row = self.connection.execute(
+                "SELECT pagination, cursor, boundary_id_num FROM sync_cursor WHERE account = ?",
+                (account,),
+            ).fetchone()
+        if resume and cursor_row is not None and cursor_row[0] == pagination:
+            resume_from = int(cursor_row[1]) if pagination == "skip" else cursor_row[1]
+            boundary_id_num = cursor_row[2]
+            ui_update_function("Resuming hero index sync...")
+            if on_resume:
+                on_resume()
+
+        result = fetch_heroes(
+            build_search_variables(account_address),
+            CONFIG["search_concurrency"],
+            ui_update_function,
+            pagination=pagination,
+            resume_from=resume_from,
+            on_page=store_page,
+            cancel_event=cancel_event,
         )
-        self.display_results(all_heroes)
-        self.update_selected_heroes_area()
-        self.async_log_to_ui(f"Total heroes found: {len(all_heroes)}")
-
-    def display_results(self, all_heroes):
-        self.results_text.config(state=tk.NORMAL)
-        self.results_text.delete(1.0, tk.END)
-        self.hero_checkboxes = []
-
-        for hero in all_heroes:
-            var = tk.IntVar(
-                value=1 if hero["id"] in self.persistent_selected_heroes else 0
+        if not result.complete:
+            # Pages come in `id desc` order, so everything above the last
+            # stored hero is already in the index
+            if result.heroes:
+                with self.lock, self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO sync_cursor "
+                        "(account, pagination, cursor, boundary_id_num) VALUES (?, ?, ?, ?)",
+                        (
+                            account,
+                            pagination,
+                            str(result.cursor),
+                            int(result.heroes[-1]["id"]),
+                        ),
+                    )
+            return False
+
+        seen_ids = {hero["id"] for hero in result.heroes}
+        with self.lock, self.connection:
+            # A resumed sweep has only seen the heroes below where the last one
+            # stopped; heroes above it that have since left are dropped by the
+            # next incremental sync
+            stored_ids = [
+                row[0]
+                for row in self.connection.execute(
+                    "SELECT id FROM heroes WHERE account = ? AND id_num < ?",
+                    (
+                        account,
+                        boundary_id_num if boundary_id_num is not None else 2**63 - 1,
+                    ),
+                )
+            ]
+            self.connection.executemany(
+                "DELETE FROM heroes WHERE account = ? AND id = ?",
+                [
+                    (account, hero_id)
+                    for hero_id in stored_ids
+                    if hero_id not in seen_ids
+                ],
             )
-            checkbox = ttk.Checkbutton(
-                self.results_text,
-                text="",
-                variable=var,
-                command=lambda h=hero, v=var: self.update_persistent_selection(h, v),
+            self.connection.execute(
+                "DELETE FROM sync_cursor WHERE account = ?", (account,)
             )
-            self.results_text.window_create(tk.END, window=checkbox)
-            self.hero_checkboxes.append((var, hero))
-
-            (
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-            ) = self.construct_detailed_info(hero)
-            self.insert_hero_info_and_abilities_inline(
-                self.results_text,
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-                checkbox,
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (account, synced_at) VALUES (?, ?)",
+                (account, time.time()),
             )
 
-        self.results_text.config(state=tk.DISABLED)
-        self.update_selected_heroes_area()
+        ui_update_function(f"Hero index synced: {len(result.heroes)} heroes.")
+        return True
 
-    def update_persistent_selection(self, hero, var):
-        if var.get() == 1:
-            self.persistent_selected_heroes[hero["id"]] = hero
-        elif hero["id"] in self.persistent_selected_heroes:
-            del self.persistent_selected_heroes[hero["id"]]
+    def load(self, account_address):
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(HERO_FIELDS)} FROM heroes "
+                "WHERE account = ? ORDER BY id_num DESC",
+                (account_address.lower(),),
+            ).fetchall()
+        return [dict(zip(HERO_FIELDS, row)) for row in rows]
 
-        self.update_selected_heroes_area()
 
-    def select_all_heroes(self):
-        all_selected = all(var.get() == 1 for var, _ in self.hero_checkboxes)
+HERO_TABLE_RANGE_COLUMNS = {
+    "summonsRemaining": ("min_summons", "max_summons"),
+    "generation": ("min_generation", "max_generation"),
+    "rarity": ("min_rarity", "max_rarity"),
+    "level": ("min_level", "max_level"),
+}
 
-        for var, hero in self.hero_checkboxes:
-            var.set(0 if all_selected else 1)
-            self.update_persistent_selection(hero, var)
+HERO_TABLE_SET_COLUMNS = {
+    "mainClass": "main_classes",
+    "subClass": "sub_classes",
+    "network": "networks",
+    "professionStr": "professions",
+}
 
-        self.update_selected_heroes_area()
+# Row offsets of the set bits in every possible byte, for decoding bitmaps
+BYTE_BIT_OFFSETS = [
+    tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)
+]
+
+
+class HeroTable:
+    # Each filterable column is stored as one bitmap per distinct value, with
+    # bit n standing for row n. A filter is then a handful of big-int OR/AND
+    # operations over the few distinct values instead of a pass over every hero.
+    def __init__(self, heroes):
+        self.heroes = list(heroes)
+        self.row_count = len(self.heroes)
+        self.all_rows = (1 << self.row_count) - 1
+        self.columns = {}
+        for column in (*HERO_TABLE_RANGE_COLUMNS, *HERO_TABLE_SET_COLUMNS):
+            rows_by_value = {}
+            for row, hero in enumerate(self.heroes):
+                rows_by_value.setdefault(hero.get(column), []).append(row)
+            self.columns[column] = {
+                value: self.rows_to_bitmap(rows)
+                for value, rows in rows_by_value.items()
+            }
 
-    def display_selected_heroes(self):
-        self.bridge_results_text.delete(1.0, tk.END)
-        for hero in self.persistent_selected_heroes.values():
-            (
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-            ) = self.construct_detailed_info(hero)
-            self.insert_hero_info_and_abilities_inline(
-                self.bridge_results_text,
-                hero_info,
-                hero_abilities,
-                mainclassvalue,
-                subclassvalue,
-                realminfo,
-                raritytag,
-                level,
-                profession,
-                None,
-            )
+    def rows_to_bitmap(self, rows):
+        bits = bytearray((self.row_count + 7) // 8)
+        for row in rows:
+            bits[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bits, "little")
+
+    def bitmap_to_rows(self, bitmap):
+        rows = []
+        bits = bitmap.to_bytes((self.row_count + 7) // 8, "little")
+        for byte_index, byte in enumerate(bits):
+            if byte:
+                base = byte_index << 3
+                rows.extend(base + bit for bit in BYTE_BIT_OFFSETS[byte])
+        return rows
+
+    def filter(self, variables):
+        bitmap = self.all_rows
+        for column, (low_key, high_key) in HERO_TABLE_RANGE_COLUMNS.items():
+            low, high = variables[low_key], variables[high_key]
+            column_bitmap = 0
+            for value, value_bitmap in self.columns[column].items():
+                if value is not None and low <= value <= high:
+                    column_bitmap |= value_bitmap
+            bitmap &= column_bitmap
+
+        # Empty selections are not filters, as with the GraphQL where clause
+        for column, key in HERO_TABLE_SET_COLUMNS.items():
+            if not variables[key]:
+                continue
+            column_bitmap = 0
+            for value in set(variables[key]):
+                column_bitmap |= self.columns[column].get(value, 0)
+            bitmap &= column_bitmap
+
+        return [self.heroes[row] for row in self.bitmap_to_rows(bitmap)]
+
+
+def find_key_file():
+    script_dir = os.getcwd()
+    key_file_name = next(
+        (f for f in os.listdir(script_dir) if f.endswith(".key")), None
+    )
+    if key_file_name is None:
+        return None
+    return os.path.join(script_dir, key_file_name)
 
-    def insert_hero_info_and_abilities_inline(
-        self,
-        text_widget,
-        hero_info,
-        abilities_info,
-        mainClassValue,
-        subclassValue,
-        priceinfo,
-        rarity_tag,
-        level,
-        profession,
-        checkbox,
-    ):
-        # Configure text tags
-        tags = {
-            "common": "white",
-            "uncommon": "lightgreen",
-            "rare": "blue",
-            "legendary": "orange",
-            "mythic": "purple",
-            "basic_class": "white",
-            "advanced_class": "lightgreen",
-            "elite_class": "#87CEEB",
-            "transcendent_class": "violet",
-        }
-        for tag, color in tags.items():
-            self.results_text.tag_config(tag, foreground=color)
-            self.selected_heroes_text.tag_config(tag, foreground=color)
-
-        # Determine class tags
-        class_tag_mappings = {
-            range(0, 12): "basic_class",
-            range(16, 22): "advanced_class",
-            range(24, 27): "elite_class",
-            (28,): "transcendent_class",
-        }
-        main_class_tag = next(
-            (tag for rng, tag in class_tag_mappings.items() if mainClassValue in rng),
-            "basic_class",
-        )
-        subclass_tag = next(
-            (tag for rng, tag in class_tag_mappings.items() if subclassValue in rng),
-            "basic_class",
-        )
 
-        # Parse hero_info
-        parts = hero_info.split(" Main Class: ")
-        parts2 = hero_info.split(" | ", 1)
-        id_label = parts2[0]
-        id_label_text, id_number = id_label.split(" ", 1)
-
-        main_class_and_beyond = parts[1]
-        main_class_name, after_main_class = main_class_and_beyond.split(", ", 1)
-        subclass_name, after_subclass = after_main_class.split(", ", 1)
-        subclass_label, subclass_class = subclass_name.split(":", 1)
-        parts = hero_info.split(", ")
-        gen_label, gen_number = parts[2].split(":", 1)
-        summons_label, summons_number = parts[3].split(":", 1)
-
-        # Format display strings
-        fixed_width = 13
-        profession_width = 9
-        small_width = 2
-        summons_width = 3
-        main_class_display = f"{main_class_name:<{fixed_width}}"
-        subclass_display = f"{subclass_class:<{fixed_width}}"
-        gen_display = f"{gen_number:<{small_width}}"
-        level_display = f"{str(level):<{small_width}}"
-        summons_display = f"{summons_number:<{summons_width}}"
-        profession_display = f"{profession:<{profession_width}}"
-
-        # Insert text into text_widget
-        if checkbox:
-            text_widget.window_create(tk.END, window=checkbox)
-        text_widget.insert(tk.END, id_label_text + " ")
-        text_widget.insert(tk.END, id_number, rarity_tag)
-        text_widget.insert(tk.END, " | Main Class: ")
-        text_widget.insert(tk.END, main_class_display, main_class_tag)
-        text_widget.insert(tk.END, "| Sub Class:")
-        text_widget.insert(tk.END, subclass_display, subclass_tag)
-        text_widget.insert(
-            tk.END,
-            f" | Level: {level_display} | Profession: {profession_display} | Gen: {gen_display} | Summons: {summons_display}",
-        )
+def decrypt_private_key(key_file_path, password_provided):
+    with open(key_file_path, "rb") as f:
+        salt = f.read(16)
+        encrypted_key = f.read()
 
-        for ability_key, ability_value in abilities_info.items():
-            text_widget.insert(tk.END, f" | {ability_key}: ")
-            ability_name = self.ability_names.get(ability_value, "Unknown")
-            ability_tag = next(
-                (
-                    tag
-                    for rng, tag in class_tag_mappings.items()
-                    if ability_value in rng
-                ),
-                "basic_class",
-            )
-            text_widget.insert(tk.END, ability_name, ability_tag)
-
-        text_widget.insert(tk.END, priceinfo)
-        text_widget.insert(tk.END, "\n")
-
-    def construct_detailed_info(self, hero):
-        fixed_id_width = 13
-        main_class_value = hero.get("mainClass")
-        subclass_value = hero.get("subClass")
-
-        main_class_name = self.class_names.get(main_class_value, "Unknown Class")
-        sub_class_name = self.class_names.get(subclass_value, "Unknown Class")
-
-        rarity = hero.get("rarity", 0)
-        rarity_tags = {
-            0: "common",
-            1: "uncommon",
-            2: "rare",
-            3: "legendary",
-            4: "mythic",
-        }
-        rarity_tag = rarity_tags.get(rarity, "common")
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+        backend=default_backend(),
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(password_provided.encode()))
+    fernet = Fernet(key)
+    decrypted_key = fernet.decrypt(encrypted_key).decode()
+    return decrypted_key
 
-        id_display = f"{hero['id']}".ljust(fixed_id_width)[:fixed_id_width]
 
-        hero_info = (
-            f"ID: {id_display} | Main Class: {main_class_name}, Sub Class: {sub_class_name}, "
-            f"Gen: {hero.get('generation', 'Unknown')}, Summons: {hero['summonsRemaining']}"
-        )
+json_output_lock = threading.Lock()
 
-        abilities_info = {
-            "A1": hero.get("active1", "Unknown"),
-            "A2": hero.get("active2", "Unknown"),
-            "P1": hero.get("passive1", "Unknown"),
-            "P2": hero.get("passive2", "Unknown"),
-        }
 
-        realm_info = f" | Realm: {hero.get('network', 'Unknown')}"
-        level = hero.get("level", "Unknown")
-        profession = hero.get("professionStr", "Unknown Profession")
-
-        return (
-            hero_info,
-            abilities_info,
-            main_class_value,
-            subclass_value,
-            realm_info,
-            rarity_tag,
-            level,
-            profession,
-        )
+def emit_json(event, **fields):
+    # One JSON object per line on stdout; bridge lanes report from several
+    # threads at once
+    with json_output_lock:
+        print(json.dumps({"event": event, **fields}, default=str), flush=True)
 
-    def bridge_heroes(self):
-        password = self.password_entry.get()
-        script_dir = os.getcwd()
-        key_file_name = [f for f in os.listdir(script_dir) if f.endswith(".key")]
-        if not key_file_name:
-            self.async_log_to_ui("Key file not found.")
-            return
 
-        key_file_name = key_file_name[0]
-        private_key = self.decrypt_key(
-            os.path.join(script_dir, key_file_name), password
+def build_cli_parser():
+    parser = argparse.ArgumentParser(
+        prog="hero_bridge",
+        description="Search for heroes and bridge them without the GUI. "
+        "Run without arguments to open the GUI.",
+    )
+    parser.add_argument(
+        "--main-class", help='main classes, e.g. "0-3, [5;7], 9" or "none"'
+    )
+    parser.add_argument("--sub-class", help="sub classes, same syntax as --main-class")
+    parser.add_argument("--min-summons", type=int)
+    parser.add_argument("--max-summons", type=int)
+    parser.add_argument("--min-gen", type=int)
+    parser.add_argument("--max-gen", type=int)
+    parser.add_argument("--min-rarity", type=int)
+    parser.add_argument("--max-rarity", type=int)
+    parser.add_argument("--min-level", type=int)
+    parser.add_argument("--max-level", type=int)
+    parser.add_argument(
+        "--realm",
+        action="append",
+        choices=["cv", "sd"],
+        default=[],
+        help="realm to search, repeatable; all realms if omitted",
+    )
+    parser.add_argument(
+        "--profession",
+        action="append",
+        choices=["foraging", "fishing", "gardening", "mining"],
+        default=[],
+        help="profession to search, repeatable; all professions if omitted",
+    )
+    parser.add_argument(
+        "--key-file", help="encrypted key file, defaults to the first .key file here"
+    )
+    parser.add_argument(
+        "--password-env",
+        default="HERO_BRIDGE_PASSWORD",
+        help="environment variable holding the key password, prompted if unset",
+    )
+    parser.add_argument("--force-resync", action="store_true")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="search and run the pre-flight checks without sending anything",
+    )
+    parser.add_argument(
+        "--wait-arrivals",
+        action="store_true",
+        help="wait for bridged heroes to arrive on their destination realm",
+    )
+    return parser
+
+
+def run_cli(argv):
+    args = build_cli_parser().parse_args(argv)
+
+    def log(message):
+        emit_json("log", message=message)
+
+    # Filters are checked before anything else, so a typo fails fast
+    try:
+        variables = build_search_variables(
+            None,
+            [args.main_class] if args.main_class else None,
+            [args.sub_class] if args.sub_class else None,
+            args.min_summons,
+            args.max_summons,
+            args.min_gen,
+            args.max_gen,
+            args.min_rarity,
+            args.max_rarity,
+            args.min_level,
+            args.max_level,
+            "cv" in args.realm,
+            "sd" in args.realm,
+            "foraging" in args.profession,
+            "fishing" in args.profession,
+            "gardening" in args.profession,
+            "mining" in args.profession,
         )
+    except ValueError as e:
+        emit_json("error", message=f"Invalid class filter: {e}")
+        return 1
+
+    key_file_path = args.key_file or find_key_file()
+    if key_file_path is None:
+        emit_json("error", message="Key file not found.")
+        return 1
+    password = os.environ.get(args.password_env)
+    if password is None:
+        password = getpass.getpass("Password: ")
+    try:
+        private_key = decrypt_private_key(key_file_path, password)
+    except Exception as e:
+        emit_json("error", message=f"Error decrypting key: {e}")
+        return 1
+    account_address = w3_serendale2.eth.account.from_key(private_key).address
+    variables["account_address"] = account_address
+
+    hero_index = HeroIndex(os.path.join(os.getcwd(), CONFIG["hero_index_file"]))
+    if not hero_index.sync(account_address, log, force=args.force_resync):
+        log("Hero index sync failed, using last synced data.")
+    heroes = HeroTable(hero_index.load(account_address)).filter(variables)
+    for hero in heroes:
+        emit_json("hero", hero=hero)
+    emit_json("search_complete", account=account_address, count=len(heroes))
+
+    if args.dry_run:
+        heroes_by_chain = {}
+        for hero in heroes:
+            config_key, destination_chain_id = bridge_route(hero)
+            if config_key is not None:
+                heroes_by_chain.setdefault(
+                    (config_key, destination_chain_id), []
+                ).append((hero["id"], hero))
+        eligible = []
+        for (
+            config_key,
+            destination_chain_id,
+        ), chain_heroes_items in heroes_by_chain.items():
+            eligible.extend(
+                hero_id
+                for hero_id, hero in preflight_chain_heroes(
+                    get_chain_client(config_key, private_key),
+                    chain_heroes_items,
+                    destination_chain_id,
+                    Web3.to_wei(CONFIG["fees_in_gwei"][config_key], "ether"),
+                    log,
+                )
+            )
+        emit_json("dry_run_complete", count=len(heroes), eligible=eligible)
+        return 0
 
-        # Process each hero bridging in a sequence on a separate thread
-        threading.Thread(
-            target=self.process_all_bridges,
-            args=(self.persistent_selected_heroes, private_key),
-        ).start()
+    bridged = []
 
-    def process_all_bridges(self, heroes, private_key):
-        heroes_items = list(heroes.items())
-        for hero_id, hero in heroes_items:
-            self.process_bridge_hero(hero_id, hero, private_key)
-            time.sleep(0.5)
+    def on_bridged(hero_id):
+        bridged.append(hero_id)
+        emit_json("bridged", hero_id=hero_id)
 
-    def process_bridge_hero(self, hero_id, hero, private_key):
-        self.async_log_to_ui(f"Starting to bridge hero {hero_id}...")
-        try:
-            # Configuration for blockchain settings based on the network of the hero
-            if hero["network"] == "kla":
-                config_key = "serendale2"
-                destination_chain_id = CONFIG["chain_ids"]["crystalvale"]
-            elif hero["network"] == "dfk":
-                config_key = "crystalvale"
-                destination_chain_id = CONFIG["chain_ids"]["serendale2"]
-
-            origin_realm_contract_address = CONFIG["contract_addresses"][config_key]
-            rpc_address = CONFIG["rpc_addresses"][config_key]
-            bridge_fee_in_wei = Web3.to_wei(CONFIG["fees_in_gwei"][config_key], "ether")
-
-            w3 = Web3(Web3.HTTPProvider(rpc_address))
-            account_address = w3.eth.account.from_key(private_key).address
-            nonce = w3.eth.get_transaction_count(account_address)
-            gas_price_gwei = {"maxFeePerGas": 26, "maxPriorityFeePerGas": 0}
-            tx_timeout_seconds = 60
-
-            # Send hero across the bridge
-            tx_receipt = send_hero(
-                origin_realm_contract_address,
-                int(hero_id),
-                destination_chain_id,
-                bridge_fee_in_wei,
-                private_key,
-                nonce,
-                gas_price_gwei,
-                tx_timeout_seconds,
-                rpc_address,
-                self.async_log_to_ui,
-            )
+    resumed, arrivals = resume_bridge_jobs(private_key, log, on_bridged)
+    arrivals += bridge_heroes_pipelined(
+        [(hero["id"], hero) for hero in heroes if hero["id"] not in resumed],
+        private_key,
+        log,
+        on_bridged,
+    )
+    if args.wait_arrivals:
+        for hero_id, arrival in arrivals:
+            emit_json("arrival", hero_id=hero_id, latency_seconds=arrival.result())
+    emit_json("bridge_complete", count=len(heroes), bridged=bridged)
+    return 0 if {hero["id"] for hero in heroes} <= set(bridged) else 1
 
-            # Update UI with the transaction result
-            if tx_receipt:
-                self.master.after(
-                    0,
-                    lambda: self.update_results_area(
-                        {"action": "remove", "hero_id": hero_id}
-                    ),
-                )
-            else:
-                self.async_log_to_ui(f"Failed to bridge hero {hero_id}.")
-        except Exception as e:
-            self.async_log_to_ui(f"Error during bridging hero {hero_id}: {str(e)}")
 
-    def decrypt_key(self, key_file_path, password_provided):
-        try:
-            with open(key_file_path, "rb") as f:
-                salt = f.read(16)
-                encrypted_key = f.read()
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-                backend=default_backend(),
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(password_provided.encode()))
-            fernet = Fernet(key)
-            decrypted_key = fernet.decrypt(encrypted_key).decode()
-            return decrypted_key
-        except Exception as e:
-            self.async_log_to_ui(f"Error decrypting key: {e}")
-            return None
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return run_cli(argv)
 
+    # Tk is only imported for the GUI, so the command-line mode starts quickly
+    # on machines without a display
+    from hero_bridge_gui import main as run_gui
 
-def main():
-    root = tk.Tk()
-    app = HeroSearchApp(root)
-    root.mainloop()
+    run_gui()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,1333 @@
+import os
+import threading
+import queue
+import time
+from collections import deque
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+from hero_bridge import (
+    CONFIG,
+    HeroIndex,
+    HeroTable,
+    bridge_heroes_pipelined,
+    bridge_journal,
+    build_search_variables,
+    decrypt_private_key,
+    resume_bridge_jobs,
+    w3_serendale2,
+)
+
+
+class HeroSearchApp:
+    def __init__(self, master):
+        self.master = master
+        self.master.title("Hero Bridge Tool")
+        self.master.configure(bg="black")
+        self.master.geometry("1500x980")
+        self.persistent_selected_heroes = {}
+        self.configure_style()
+
+        # Create and place a container frame to hold all UI elements
+        self.container = ttk.Frame(self.master, style="TFrame")
+        self.container.pack(fill="both", expand=True)
+        self.create_frames()
+        self.init_class_and_ability_mappings()
+        self.main_class_selections = set()
+        self.sub_class_selections = set()
+        self.selected_heroes = []
+        self.hero_index = HeroIndex(
+            os.path.join(os.getcwd(), CONFIG["hero_index_file"])
+        )
+        self.hero_table = None
+        self.hero_table_key = None
+        self.hero_table_lock = threading.Lock()
+        # Known after the first successful decrypt; searching only needs the
+        # address, so later searches skip the key derivation
+        self.account_address = None
+        self.filter_variables = None
+        self.refilter_job = None
+        self.result_heroes = {}
+        self.search_cancel_event = None
+        self.pending_rows = deque()
+        self.render_job = None
+        self.log_queue = queue.SimpleQueue()
+        self.init_ui_elements()
+        for filter_var in (
+            self.min_summon_var,
+            self.max_summon_var,
+            self.min_generation_var,
+            self.max_generation_var,
+            self.min_rarity_var,
+            self.max_rarity_var,
+            self.min_level_var,
+            self.max_level_var,
+            self.cv_var,
+            self.sd_var,
+            self.foraging_var,
+            self.fishing_var,
+            self.gardening_var,
+            self.mining_var,
+        ):
+            filter_var.trace_add("write", self.schedule_refilter)
+        self._log_to_ui()
+        unfinished_jobs = bridge_journal.unfinished()
+        if unfinished_jobs:
+            self.log_to_ui(
+                f"{len(unfinished_jobs)} bridge jobs were left unfinished; "
+                "they will be reconciled on the next Bridge."
+            )
+
+    def configure_style(self):
+        style = ttk.Style()
+        style.configure("TFrame", background="black")
+        style.configure(
+            "TButton",
+            background="black",
+            foreground="white",
+            borderwidth=1,
+            focuscolor="none",
+        )
+        style.configure("TLabel", background="black", foreground="white")
+        style.map(
+            "TButton",
+            background=[("active", "grey"), ("!disabled", "black")],
+            foreground=[("active", "white")],
+        )
+        style.configure("TScale", background="black", foreground="white")
+        style.configure(
+            "Results.Treeview",
+            background="black",
+            fieldbackground="black",
+            foreground="white",
+        )
+        style.configure(
+            "TRadiobutton",
+            background="black",
+            foreground="white",
+            indicatorbackground="black",
+            indicatoron=False,
+        )
+
+    def create_frames(self):
+        self.search_frame = ttk.Frame(self.container, style="TFrame")
+        self.search_frame.grid(row=0, column=0, sticky="nsew")
+
+        self.results_frame = ttk.Frame(self.container, style="TFrame")
+        self.results_frame.grid(row=0, column=1, sticky="nsew", padx=10)
+
+        # Configure row and column weights for resizing
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)  # Fixed width for search_frame
+        self.container.grid_columnconfigure(
+            1, weight=1
+        )  # Expandable width for results_frame
+
+    def init_class_and_ability_mappings(self):
+        self.rarity_map = {
+            0: "common",
+            1: "uncommon",
+            2: "rare",
+            3: "legendary",
+            4: "mythic",
+        }
+
+        self.class_names = {
+            0: "Warrior",
+            1: "Knight",
+            2: "Thief",
+            3: "Archer",
+            4: "Priest",
+            5: "Wizard",
+            6: "Monk",
+            7: "Pirate",
+            8: "Berserker",
+            9: "Seer",
+            10: "Legionnaire",
+            11: "Scholar",
+            16: "Paladin",
+            17: "DarkKnight",
+            18: "Summoner",
+            19: "Ninja",
+            20: "Shapeshifter",
+            21: "Bard",
+            24: "Dragoon",
+            25: "Sage",
+            26: "Spellbow",
+            28: "DreadKnight",
+        }
+
+        # Tag for every class or ability id, by tier
+        self.tier_tags = {}
+        for ids, tag in (
+            (range(0, 12), "basic_class"),
+            (range(16, 22), "advanced_class"),
+            (range(24, 27), "elite_class"),
+            ((28,), "transcendent_class"),
+        ):
+            self.tier_tags.update(dict.fromkeys(ids, tag))
+
+        self.row_tag_colors = {
+            "common": "white",
+            "uncommon": "lightgreen",
+            "rare": "blue",
+            "legendary": "orange",
+            "mythic": "purple",
+            "basic_class": "white",
+            "advanced_class": "lightgreen",
+            "elite_class": "#87CEEB",
+            "transcendent_class": "violet",
+        }
+
+        self.ability_names = {
+            0: "B1",
+            1: "B2",
+            2: "B3",
+            3: "B4",
+            4: "B5",
+            5: "B6",
+            6: "B7",
+            7: "B8",
+            16: "A1",
+            17: "A2",
+            18: "A3",
+            19: "A4",
+            24: "E1",
+            25: "E2",
+            28: "T1",
+        }
+
+    def init_ui_elements(self):
+        self.init_class_selection(
+            self.search_frame,
+            "Select Main Class",
+            self.main_class_selections,
+            0,
+            is_main_class=True,
+        )
+        self.init_class_selection(
+            self.search_frame,
+            "Select Sub Class",
+            self.sub_class_selections,
+            1,
+            is_main_class=False,
+        )
+        self.init_summon_selection(self.search_frame)
+        self.init_generation_selection(self.search_frame)
+        self.init_rarity_selection(self.search_frame)
+        self.init_level_selection(self.search_frame)
+        self.init_realm_selection(self.search_frame)
+        self.init_profession_selection(self.search_frame)
+        self.init_password_entry(self.search_frame)
+        self.init_search_button(self.search_frame)
+        self.init_select_all_button(self.search_frame)
+        self.init_bridge_selected_button(self.search_frame)
+        self.init_resync_button(self.search_frame)
+        self.init_cancel_search_button(self.search_frame)
+        self.init_results_area()
+        self.init_selected_heroes_area()
+
+    def init_results_area(self):
+        # Search results live in a Treeview: rows are plain items rather than
+        # widgets and only the visible ones are drawn, so scrolling costs the
+        # same for ten heroes or ten thousand
+        self.results_tree_frame = ttk.Frame(self.results_frame, style="TFrame")
+        self.results_tree_frame.pack(fill="both", expand=True)
+
+        columns = {
+            "selected": ("", 30),
+            "id": ("ID", 120),
+            "main_class": ("Main Class", 100),
+            "sub_class": ("Sub Class", 100),
+            "level": ("Level", 50),
+            "profession": ("Profession", 80),
+            "generation": ("Gen", 40),
+            "summons": ("Summons", 60),
+            "A1": ("A1", 40),
+            "A2": ("A2", 40),
+            "P1": ("P1", 40),
+            "P2": ("P2", 40),
+            "realm": ("Realm", 60),
+        }
+        self.results_tree = ttk.Treeview(
+            self.results_tree_frame,
+            columns=tuple(columns),
+            show="headings",
+            selectmode="browse",
+            style="Results.Treeview",
+        )
+        for column, (heading, width) in columns.items():
+            self.results_tree.heading(column, text=heading)
+            self.results_tree.column(column, width=width, anchor="w", stretch=True)
+        for rarity, color in (
+            ("common", "white"),
+            ("uncommon", "lightgreen"),
+            ("rare", "blue"),
+            ("legendary", "orange"),
+            ("mythic", "purple"),
+        ):
+            self.results_tree.tag_configure(rarity, foreground=color)
+        self.results_tree.bind("<Button-1>", self.on_results_tree_click)
+        self.results_tree.bind("<space>", self.on_results_tree_key)
+
+        results_scrollbar = ttk.Scrollbar(
+            self.results_tree_frame,
+            orient="vertical",
+            command=self.results_tree.yview,
+        )
+        self.results_tree.configure(yscrollcommand=results_scrollbar.set)
+        results_scrollbar.pack(side="right", fill="y")
+        self.results_tree.pack(side="left", fill="both", expand=True)
+
+        self.results_text = scrolledtext.ScrolledText(
+            self.results_frame, width=150, height=8, bg="black", fg="white"
+        )
+        self.results_text.pack(fill="both", expand=False)
+        self.results_text.config(state=tk.DISABLED)
+
+    def init_selected_heroes_area(self):
+        self.selected_heroes_frame = ttk.Frame(self.results_frame, style="TFrame")
+        self.selected_heroes_frame.pack(fill="both", expand=True)
+
+        self.selected_heroes_label = ttk.Label(
+            self.selected_heroes_frame, text="Selected Heroes", style="TLabel"
+        )
+        self.selected_heroes_label.pack(anchor="w", padx=5)
+
+        self.selected_heroes_text = scrolledtext.ScrolledText(
+            self.selected_heroes_frame, width=150, height=5, bg="black", fg="white"
+        )
+        self.selected_heroes_text.pack(fill="both", expand=True)
+        self.selected_heroes_text.config(state=tk.DISABLED)
+        self.configure_row_tags(self.selected_heroes_text)
+
+    def log_to_ui(self, message):
+        # Safe from any thread: messages are queued and written by the Tk loop
+        self.log_queue.put(message)
+
+    def _log_to_ui(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if messages:
+            self.results_text.config(state=tk.NORMAL)
+            self.results_text.insert(
+                tk.END, "".join(f"{message}\n" for message in messages)
+            )
+            # Keep only the newest lines so long sessions stay bounded
+            line_count = int(self.results_text.index("end-1c").split(".")[0]) - 1
+            excess_lines = line_count - CONFIG["log_max_lines"]
+            if excess_lines > 0:
+                self.results_text.delete("1.0", f"{excess_lines + 1}.0")
+            self.results_text.see(tk.END)
+            self.results_text.config(state=tk.DISABLED)
+
+        self.master.after(CONFIG["log_flush_interval_ms"], self._log_to_ui)
+
+    def async_log_to_ui(self, message):
+        self.log_to_ui(message)
+
+    def update_results_area(self, data):
+        if data["action"] == "remove":
+            self.persistent_selected_heroes.pop(data["hero_id"], None)
+            self.update_selected_heroes_area(removed=(data["hero_id"],))
+            if self.results_tree.exists(data["hero_id"]):
+                self.results_tree.set(data["hero_id"], "selected", "\u2610")
+            self.log_to_ui(f"Hero ID {data['hero_id']} sent, waiting for it to arrive.")
+
+    def init_profession_selection(self, master):
+        ttk.Label(master, text="Select Profession:").grid(
+            row=13, column=0, columnspan=4, sticky="w", padx=5, pady=(10, 0)
+        )
+
+        buttons_frame = ttk.Frame(master)
+        buttons_frame.grid(row=14, column=0, columnspan=4, sticky="ew", padx=5)
+
+        self.foraging_var = tk.IntVar(value=0)
+        self.fishing_var = tk.IntVar(value=0)
+        self.gardening_var = tk.IntVar(value=0)
+        self.mining_var = tk.IntVar(value=0)
+
+        self.foraging_button = tk.Button(
+            buttons_frame,
+            text="Foraging",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_profession_selection(
+                self.foraging_var, self.foraging_button
+            ),
+        )
+        self.foraging_button.grid(row=0, column=0, sticky="ew", padx=5)
+
+        self.fishing_button = tk.Button(
+            buttons_frame,
+            text="Fishing",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_profession_selection(
+                self.fishing_var, self.fishing_button
+            ),
+        )
+        self.fishing_button.grid(row=0, column=1, sticky="ew", padx=5)
+
+        self.gardening_button = tk.Button(
+            buttons_frame,
+            text="Gardening",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_profession_selection(
+                self.gardening_var, self.gardening_button
+            ),
+        )
+        self.gardening_button.grid(row=0, column=2, sticky="ew", padx=5)
+
+        self.mining_button = tk.Button(
+            buttons_frame,
+            text="Mining",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_profession_selection(
+                self.mining_var, self.mining_button
+            ),
+        )
+        self.mining_button.grid(row=0, column=3, sticky="ew", padx=5)
+
+        buttons_frame.grid_columnconfigure(0, weight=1)
+        buttons_frame.grid_columnconfigure(1, weight=1)
+        buttons_frame.grid_columnconfigure(2, weight=1)
+        buttons_frame.grid_columnconfigure(3, weight=1)
+
+    def toggle_profession_selection(self, profession_var, button):
+        if profession_var.get() == 1:
+            profession_var.set(0)
+            button.config(
+                bg="black",
+                fg="white",
+                highlightbackground="white",
+                highlightthickness=2,
+            )
+        else:
+            profession_var.set(1)
+            button.config(
+                bg="green",
+                fg="white",
+                highlightbackground="white",
+                highlightthickness=2,
+            )
+
+    def init_realm_selection(self, master):
+        ttk.Label(master, text="Select Realm:").grid(
+            row=11, column=0, columnspan=4, sticky="w", padx=5, pady=(10, 0)
+        )
+
+        buttons_frame = ttk.Frame(master)
+        buttons_frame.grid(row=12, column=0, columnspan=4, sticky="ew", padx=5)
+
+        self.cv_var = tk.IntVar(value=0)
+        self.sd_var = tk.IntVar(value=0)
+
+        self.cv_button = tk.Button(
+            buttons_frame,
+            text="Crystalvale",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_realm_selection(self.cv_var, self.cv_button),
+        )
+        self.cv_button.grid(row=0, column=0, sticky="ew", padx=5)
+
+        self.sd_button = tk.Button(
+            buttons_frame,
+            text="Serendale",
+            bg="black",
+            fg="white",
+            width=15,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.toggle_realm_selection(self.sd_var, self.sd_button),
+        )
+        self.sd_button.grid(row=0, column=1, sticky="ew", padx=5)
+
+        buttons_frame.grid_columnconfigure(0, weight=1)
+        buttons_frame.grid_columnconfigure(1, weight=1)
+
+    def toggle_realm_selection(self, realm_var, button):
+        if realm_var.get() == 1:
+            realm_var.set(0)
+            button.config(
+                bg="black",
+                fg="white",
+                highlightbackground="white",
+                highlightthickness=2,
+            )
+        else:
+            realm_var.set(1)
+            button.config(
+                bg="green",
+                fg="white",
+                highlightbackground="white",
+                highlightthickness=2,
+            )
+
+    def init_level_selection(self, master):
+        ttk.Label(master, text="Hero Level Range:").grid(
+            row=22, column=0, columnspan=3, sticky="w", padx=5
+        )
+
+        self.min_level_var = tk.IntVar(value=1)
+        ttk.Label(master, text="Min:").grid(row=23, column=0, sticky="w", padx=5)
+        self.min_level_scale = ttk.Scale(
+            master,
+            from_=1,
+            to=20,
+            orient="horizontal",
+            variable=self.min_level_var,
+            command=self.update_level_min_label,
+        )
+        self.min_level_scale.grid(row=23, column=1, sticky="ew", padx=5)
+        self.min_level_label = ttk.Label(master, textvariable=self.min_level_var)
+        self.min_level_label.grid(row=23, column=2, sticky="w", padx=5)
+
+        self.max_level_var = tk.IntVar(value=20)
+        ttk.Label(master, text="Max:").grid(row=24, column=0, sticky="w", padx=5)
+        self.max_level_scale = ttk.Scale(
+            master,
+            from_=1,
+            to=20,
+            orient="horizontal",
+            variable=self.max_level_var,
+            command=self.update_level_max_label,
+        )
+        self.max_level_scale.grid(row=24, column=1, sticky="ew", padx=5)
+        self.max_level_label = ttk.Label(master, textvariable=self.max_level_var)
+        self.max_level_label.grid(row=24, column=2, sticky="w", padx=5)
+
+    def update_level_min_label(self, event=None):
+        self.min_level_var.set(int(self.min_level_scale.get()))
+
+    def update_level_max_label(self, event=None):
+        self.max_level_var.set(int(self.max_level_scale.get()))
+
+    def init_generation_selection(self, master):
+        ttk.Label(master, text="Generation Range:").grid(
+            row=19, column=0, columnspan=3, sticky="w", padx=5, pady=0
+        )
+
+        self.min_generation_var = tk.IntVar(value=0)
+        ttk.Label(master, text="Min:").grid(
+            row=20, column=0, sticky="w", padx=5, pady=0
+        )
+        self.min_generation_scale = ttk.Scale(
+            master,
+            from_=0,
+            to=69,
+            orient="horizontal",
+            variable=self.min_generation_var,
+            command=self.update_generation_min_label,
+        )
+        self.min_generation_scale.grid(row=20, column=1, sticky="ew", padx=5, pady=0)
+        self.min_generation_label = ttk.Label(
+            master, textvariable=self.min_generation_var
+        )
+        self.min_generation_label.grid(row=20, column=2, sticky="w", padx=5, pady=0)
+
+        self.max_generation_var = tk.IntVar(value=69)
+        ttk.Label(master, text="Max:").grid(
+            row=21, column=0, sticky="w", padx=5, pady=0
+        )
+        self.max_generation_scale = ttk.Scale(
+            master,
+            from_=0,
+            to=69,
+            orient="horizontal",
+            variable=self.max_generation_var,
+            command=self.update_generation_max_label,
+        )
+        self.max_generation_scale.grid(row=21, column=1, sticky="ew", padx=5, pady=0)
+        self.max_generation_label = ttk.Label(
+            master, textvariable=self.max_generation_var
+        )
+        self.max_generation_label.grid(row=21, column=2, sticky="w", padx=5, pady=0)
+
+    def init_class_selection(
+        self, master, label_text, selection_set, offset, is_main_class=True
+    ):
+        ttk.Label(master, text=label_text).grid(
+            row=offset * 6, column=0, columnspan=4, sticky="w"
+        )
+
+        buttons_frame = ttk.Frame(master)
+        buttons_frame.grid(row=1 + offset * 6, column=0, columnspan=4, sticky="ew")
+
+        class_buttons = {}
+
+        for index, (class_number, class_name) in enumerate(self.class_names.items()):
+            btn = tk.Button(
+                buttons_frame,
+                text=f"{class_name}",
+                bg="black",
+                fg="white",
+                width=15,
+                highlightbackground="white",
+                highlightcolor="white",
+                highlightthickness=2,
+                bd=5,
+                command=lambda cn=class_number, s=selection_set: self.toggle_class_selection(
+                    cn, s, class_buttons
+                ),
+            )
+            btn.grid(
+                row=(index // 4 + 1), column=index % 4, sticky="ew", padx=5, pady=2
+            )
+            class_buttons[class_number] = btn
+
+        tk.Button(
+            buttons_frame,
+            text="All",
+            command=lambda: self.select_classes(
+                class_buttons, selection_set, list(self.class_names.keys())
+            ),
+        ).grid(row=0, column=0, sticky="ew", padx=5)
+        tk.Button(
+            buttons_frame,
+            text="Basic",
+            command=lambda: self.select_classes(
+                class_buttons, selection_set, list(range(0, 12))
+            ),
+        ).grid(row=0, column=1, sticky="ew", padx=5)
+        tk.Button(
+            buttons_frame,
+            text="Advanced",
+            command=lambda: self.select_classes(
+                class_buttons, selection_set, list(range(16, 22))
+            ),
+        ).grid(row=0, column=2, sticky="ew", padx=5)
+        tk.Button(
+            buttons_frame,
+            text="Elite",
+            command=lambda: self.select_classes(
+                class_buttons, selection_set, list(range(24, 27))
+            ),
+        ).grid(row=0, column=3, sticky="ew", padx=5)
+
+        buttons_frame.grid_columnconfigure(tuple(range(4)), weight=1)
+
+    def init_summon_selection(self, master):
+        ttk.Label(master, text="Summons Range:").grid(
+            row=16, column=0, columnspan=3, sticky="w", padx=5
+        )
+
+        self.min_summon_var = tk.IntVar(value=0)
+        ttk.Label(master, text="Min:").grid(row=17, column=0, sticky="w", padx=5)
+        self.min_summon_scale = ttk.Scale(
+            master,
+            from_=0,
+            to_=11,
+            orient="horizontal",
+            variable=self.min_summon_var,
+            command=self.update_summon_min_label,
+        )
+        self.min_summon_scale.grid(row=17, column=1, sticky="ew", padx=5)
+        self.min_summon_label = ttk.Label(master, textvariable=self.min_summon_var)
+        self.min_summon_label.grid(row=17, column=2, sticky="w", padx=5)
+
+        self.max_summon_var = tk.IntVar(value=11)
+        ttk.Label(master, text="Max:").grid(row=18, column=0, sticky="w", padx=5)
+        self.max_summon_label = ttk.Label(master, textvariable=self.max_summon_var)
+        self.max_summon_label.grid(row=18, column=2, sticky="w", padx=5)
+        self.max_summon_scale = ttk.Scale(
+            master,
+            from_=0,
+            to_=11,
+            orient="horizontal",
+            variable=self.max_summon_var,
+            command=self.update_summon_max_label,
+        )
+        self.max_summon_scale.grid(row=18, column=1, sticky="ew", padx=5)
+
+    def init_password_entry(self, master):
+        self.password_label = ttk.Label(
+            self.search_frame, text="Password:", style="TLabel"
+        )
+        self.password_label.grid(row=16, column=3, sticky="w", padx=5)
+        self.password_entry = ttk.Entry(self.search_frame, show="*")
+        self.password_entry.grid(row=17, column=3, sticky="ew", padx=5)
+
+    def init_search_button(self, master):
+        self.search_button = tk.Button(
+            self.search_frame,
+            text="Search",
+            bg="green",
+            fg="white",
+            width=20,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=self.perform_search,
+        )
+        self.search_button.grid(row=18, column=3, rowspan=2, sticky="ew", padx=5)
+
+    def init_select_all_button(self, master):
+        self.select_all_button = tk.Button(
+            self.search_frame,
+            text="Select All",
+            bg="blue",
+            fg="white",
+            width=20,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=self.select_all_heroes,
+        )
+        self.select_all_button.grid(row=20, column=3, rowspan=2, sticky="ew", padx=5)
+
+    def init_bridge_selected_button(self, master):
+        self.bridge_selected_button = tk.Button(
+            self.search_frame,
+            text="Bridge Selected",
+            bg="red",
+            fg="white",
+            width=20,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=self.bridge_heroes,
+        )
+        self.bridge_selected_button.grid(
+            row=22, column=3, rowspan=2, sticky="ew", padx=5
+        )
+
+    def init_resync_button(self, master):
+        self.resync_button = tk.Button(
+            self.search_frame,
+            text="Force Resync",
+            bg="black",
+            fg="white",
+            width=20,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=lambda: self.perform_search(force_resync=True),
+        )
+        self.resync_button.grid(row=24, column=3, rowspan=2, sticky="ew", padx=5)
+
+        self.index_status_var = tk.StringVar(value="Hero index: not synced")
+        self.index_status_label = ttk.Label(
+            self.search_frame, textvariable=self.index_status_var, style="TLabel"
+        )
+        self.index_status_label.grid(row=26, column=3, sticky="w", padx=5)
+
+    def init_cancel_search_button(self, master):
+        self.cancel_search_button = tk.Button(
+            self.search_frame,
+            text="Cancel Search",
+            bg="black",
+            fg="white",
+            width=20,
+            highlightbackground="white",
+            highlightcolor="white",
+            highlightthickness=2,
+            bd=5,
+            command=self.cancel_search,
+        )
+        self.cancel_search_button.grid(row=27, column=3, sticky="ew", padx=5)
+
+        self.heroes_loaded_var = tk.StringVar(value="0 heroes loaded")
+        self.heroes_loaded_label = ttk.Label(
+            self.search_frame, textvariable=self.heroes_loaded_var, style="TLabel"
+        )
+        self.heroes_loaded_label.grid(row=28, column=3, sticky="w", padx=5)
+
+    def update_index_status(self, account_address):
+        synced_at = self.hero_index.last_synced(account_address)
+        if synced_at is None:
+            self.index_status_var.set("Hero index: not synced")
+        else:
+            self.index_status_var.set(
+                f"Hero index synced: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(synced_at))}"
+            )
+
+    def init_rarity_selection(self, master):
+        self.min_rarity_var = tk.IntVar(value=0)
+        self.max_rarity_var = tk.IntVar(value=4)
+
+        ttk.Label(master, text="Rarity Range:").grid(
+            row=25, column=0, columnspan=3, sticky="w", padx=5
+        )
+
+        self.min_rarity_name = tk.StringVar(value="common")
+        self.max_rarity_name = tk.StringVar(value="mythic")
+
+        ttk.Label(master, text="Min:").grid(row=26, column=0, sticky="w", padx=5)
+        self.min_rarity_label = ttk.Label(
+            master, textvariable=self.min_rarity_name, width=10
+        )
+        self.min_rarity_label.grid(row=26, column=2, sticky="ew")
+
+        self.min_rarity_scale = ttk.Scale(
+            master,
+            from_=0,
+            to=4,
+            orient="horizontal",
+            variable=self.min_rarity_var,
+            command=lambda e: self.update_rarity_labels(),
+        )
+        self.min_rarity_scale.grid(row=26, column=1, sticky="ew", padx=5)
+
+        ttk.Label(master, text="Max:").grid(row=27, column=0, sticky="w", padx=5)
+        self.max_rarity_label = ttk.Label(
+            master, textvariable=self.max_rarity_name, width=10
+        )
+        self.max_rarity_label.grid(row=27, column=2, sticky="ew")
+
+        self.max_rarity_scale = ttk.Scale(
+            master,
+            from_=0,
+            to=4,
+            orient="horizontal",
+            variable=self.max_rarity_var,
+            command=lambda e: self.update_rarity_labels(),
+        )
+        self.max_rarity_scale.grid(row=27, column=1, sticky="ew", padx=5)
+
+        master.grid_columnconfigure(1, weight=1)
+        master.grid_columnconfigure(2, weight=1)
+
+    def update_rarity_labels(self):
+        rarity_map = {
+            0: "common",
+            1: "uncommon",
+            2: "rare",
+            3: "legendary",
+            4: "mythic",
+        }
+        self.min_rarity_name.set(f"{rarity_map[self.min_rarity_var.get()]:<10}")
+        self.max_rarity_name.set(f"{rarity_map[self.max_rarity_var.get()]:<10}")
+
+    def update_summon_min_label(self, event=None):
+        self.min_summon_var.set(int(self.min_summon_scale.get()))
+
+    def update_summon_max_label(self, event=None):
+        self.max_summon_var.set(int(self.max_summon_scale.get()))
+
+    def update_generation_min_label(self, event=None):
+        self.min_generation_var.set(int(self.min_generation_scale.get()))
+
+    def update_generation_max_label(self, event=None):
+        self.max_generation_var.set(int(self.max_generation_scale.get()))
+
+    def update_selected_heroes_area(self, added=(), removed=()):
+        # Only the rows that changed are touched: every row carries its own
+        # "selected_<id>" tag, so it can be found and deleted on its own
+        self.selected_heroes_text.config(state=tk.NORMAL)
+
+        for hero_id in removed:
+            row_tag = f"selected_{hero_id}"
+            row_ranges = self.selected_heroes_text.tag_ranges(row_tag)
+            if row_ranges:
+                self.selected_heroes_text.delete(row_ranges[0], row_ranges[-1])
+            self.selected_heroes_text.tag_delete(row_tag)
+
+        for hero in added:
+            row_start = self.selected_heroes_text.index("end-1c")
+            self.insert_hero_row(self.selected_heroes_text, hero)
+            self.selected_heroes_text.tag_add(
+                f"selected_{hero['id']}", row_start, "end-1c"
+            )
+
+        self.selected_heroes_text.config(state=tk.DISABLED)
+
+    def toggle_class_selection(self, class_number, selection_set, class_buttons):
+        if class_number in selection_set:
+            selection_set.remove(class_number)
+        else:
+            selection_set.add(class_number)
+        bg_color = "green" if class_number in selection_set else "black"
+        class_buttons[class_number].config(
+            bg=bg_color, fg="white", highlightbackground="white", highlightthickness=2
+        )
+        self.schedule_refilter()
+
+    def select_classes(self, class_buttons, selection_set, class_range):
+        all_selected = all(
+            class_number in selection_set for class_number in class_range
+        )
+        for class_number in class_range:
+            if class_number in class_buttons:
+                if all_selected:
+                    selection_set.remove(class_number)
+                    class_buttons[class_number].config(
+                        bg="black",
+                        fg="white",
+                        highlightbackground="white",
+                        highlightthickness=2,
+                    )
+                else:
+                    selection_set.add(class_number)
+                    class_buttons[class_number].config(
+                        bg="green",
+                        fg="white",
+                        highlightbackground="white",
+                        highlightthickness=2,
+                    )
+        self.schedule_refilter()
+
+    def search_variables(self):
+        return build_search_variables(
+            None,
+            set(self.main_class_selections),
+            set(self.sub_class_selections),
+            self.min_summon_var.get(),
+            self.max_summon_var.get(),
+            self.min_generation_var.get(),
+            self.max_generation_var.get(),
+            self.min_rarity_var.get(),
+            self.max_rarity_var.get(),
+            self.min_level_var.get(),
+            self.max_level_var.get(),
+            self.cv_var.get(),
+            self.sd_var.get(),
+            self.foraging_var.get(),
+            self.fishing_var.get(),
+            self.gardening_var.get(),
+            self.mining_var.get(),
+        )
+
+    def schedule_refilter(self, *trace_args):
+        # Sliders write their variable on every motion event; one re-filter
+        # per idle pass is enough
+        if self.refilter_job is None:
+            self.refilter_job = self.master.after_idle(self.run_refilter)
+
+    def run_refilter(self):
+        self.refilter_job = None
+        variables = self.search_variables()
+        if variables != self.filter_variables:
+            self.refilter_results(variables, require_fresh=False)
+
+    def refilter_results(self, variables, require_fresh=True):
+        # Filters the already loaded hero table on the Tk thread, which takes
+        # well under a millisecond: no key, no sync and no worker thread.
+        # Returns None when there is no usable table and a full search is
+        # needed instead.
+        if self.account_address is None or self.search_cancel_event is not None:
+            return None
+        synced_at = self.hero_index.last_synced(self.account_address)
+        if require_fresh and (
+            synced_at is None or time.time() - synced_at >= CONFIG["hero_index_max_age"]
+        ):
+            return None
+        with self.hero_table_lock:
+            if self.hero_table_key != (self.account_address.lower(), synced_at):
+                return None
+            hero_table = self.hero_table
+
+        self.filter_variables = variables
+        all_heroes = hero_table.filter(variables)
+        self.display_results(all_heroes)
+        return all_heroes
+
+    def perform_search(self, force_resync=False):
+        # Only Tk state is read here. A fresh, already loaded index is filtered
+        # in place; otherwise key decryption, syncing and filtering run on a
+        # worker thread and rows come back through master.after
+        variables = self.search_variables()
+        if not force_resync:
+            all_heroes = self.refilter_results(variables)
+            if all_heroes is not None:
+                self.async_log_to_ui(f"Total heroes found: {len(all_heroes)}")
+                return
+        password = self.password_entry.get()
+        self.filter_variables = dict(variables)
+
+        # A search already running is superseded: it is cancelled and any rows
+        # it still delivers are dropped
+        self.cancel_search()
+        cancel_event = threading.Event()
+        self.search_cancel_event = cancel_event
+        self.clear_results()
+        self.heroes_loaded_var.set("0 heroes loaded")
+        self.search_button.config(text="Searching...", bg="grey")
+        threading.Thread(
+            target=self.run_search,
+            args=(password, variables, force_resync, cancel_event),
+            daemon=True,
+        ).start()
+
+    def run_search(self, password, variables, force_resync, cancel_event):
+        # Any page fetched while syncing is filtered and handed to the Tk loop
+        # straight away, the final answer comes from the index
+        account_address = None
+        synced = False
+        streamed = []
+        resumed = []
+        all_heroes = None
+
+        def on_page(heroes):
+            matches = HeroTable(heroes).filter(variables)
+            streamed.extend(matches)
+            self.master.after(0, lambda: self.stream_results(matches, cancel_event))
+
+        try:
+            account_address = self.account_address
+            if account_address is None:
+                private_key = self.load_private_key(password)
+                if not private_key:
+                    self.async_log_to_ui("Failed to decrypt private key.")
+                    return
+                account_address = w3_serendale2.eth.account.from_key(
+                    private_key
+                ).address
+                self.account_address = account_address
+            variables["account_address"] = account_address
+            try:
+                synced = self.hero_index.sync(
+                    account_address,
+                    self.async_log_to_ui,
+                    force=force_resync,
+                    on_page=on_page,
+                    cancel_event=cancel_event,
+                    on_resume=lambda: resumed.append(True),
+                )
+            except Exception as e:
+                self.async_log_to_ui(f"Error during search: {str(e)}")
+            # Loading the index and building the table stay on this thread;
+            # the Tk loop only receives the filtered rows
+            if not cancel_event.is_set():
+                all_heroes = self.load_hero_table(account_address).filter(variables)
+        except Exception as e:
+            self.async_log_to_ui(f"Error during search: {str(e)}")
+        finally:
+            self.master.after(
+                0,
+                lambda: self.finish_search(
+                    account_address,
+                    all_heroes,
+                    synced,
+                    bool(streamed) and not resumed,
+                    cancel_event,
+                ),
+            )
+
+    def stream_results(self, heroes, cancel_event):
+        if cancel_event is not self.search_cancel_event or cancel_event.is_set():
+            return
+        self.queue_results(heroes)
+
+    def finish_search(
+        self, account_address, all_heroes, synced, streamed_all, cancel_event
+    ):
+        if cancel_event is not self.search_cancel_event:
+            return
+        self.search_cancel_event = None
+        self.search_button.config(text="Search", bg="green")
+        if cancel_event.is_set():
+            self.async_log_to_ui("Search cancelled.")
+            return
+        if account_address is None or all_heroes is None:
+            return
+
+        if not synced:
+            self.async_log_to_ui("Hero index sync failed, showing last synced data.")
+        self.update_index_status(account_address)
+        # A completed streaming sync from the first page has already queued
+        # exactly these rows; a resumed one only streamed those below its cursor
+        if not (synced and streamed_all):
+            self.display_results(all_heroes)
+        self.async_log_to_ui(f"Total heroes found: {len(all_heroes)}")
+
+    def cancel_search(self):
+        if self.search_cancel_event is not None:
+            self.search_cancel_event.set()
+
+    def load_private_key(self, password):
+        script_dir = os.getcwd()
+        key_file_name = next(
+            (f for f in os.listdir(script_dir) if f.endswith(".key")), None
+        )
+        if key_file_name is None:
+            self.async_log_to_ui("Key file not found.")
+            return None
+        return self.decrypt_key(os.path.join(script_dir, key_file_name), password)
+
+    def load_hero_table(self, account_address):
+        # Rebuilt only when the index has synced since the table was loaded.
+        # Runs on search worker threads, and a superseded search may still be
+        # finishing when the next one starts.
+        with self.hero_table_lock:
+            table_key = (
+                account_address.lower(),
+                self.hero_index.last_synced(account_address),
+            )
+            if self.hero_table is None or self.hero_table_key != table_key:
+                self.hero_table = HeroTable(self.hero_index.load(account_address))
+                self.hero_table_key = table_key
+            return self.hero_table
+
+    def display_results(self, all_heroes):
+        self.clear_results()
+        self.queue_results(all_heroes)
+
+    def clear_results(self):
+        if self.render_job is not None:
+            self.master.after_cancel(self.render_job)
+            self.render_job = None
+        self.pending_rows.clear()
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.result_heroes = {}
+
+    def queue_results(self, heroes):
+        # Rows are inserted a chunk per event-loop tick so the window keeps
+        # handling input and redraws while a large result set is added
+        self.pending_rows.extend(heroes)
+        if self.render_job is None:
+            self.render_job = self.master.after(0, self.render_pending_rows)
+
+    def render_pending_rows(self):
+        chunk = [
+            self.pending_rows.popleft()
+            for _ in range(min(CONFIG["render_chunk_size"], len(self.pending_rows)))
+        ]
+        self.append_results(chunk)
+        self.heroes_loaded_var.set(f"{len(self.result_heroes)} heroes loaded")
+        if self.pending_rows:
+            self.render_job = self.master.after(1, self.render_pending_rows)
+        else:
+            self.render_job = None
+
+    def append_results(self, heroes):
+        for hero in heroes:
+            # A skip-paginated sync can return a hero twice when heroes shift
+            # between pages, and a Treeview iid can only be used once
+            if hero["id"] in self.result_heroes:
+                continue
+            self.result_heroes[hero["id"]] = hero
+            self.results_tree.insert(
+                "",
+                tk.END,
+                iid=hero["id"],
+                values=self.result_row_values(hero),
+                tags=(self.rarity_map.get(hero.get("rarity", 0), "common"),),
+            )
+
+    def result_row_values(self, hero):
+        return (
+            "\u2611" if hero["id"] in self.persistent_selected_heroes else "\u2610",
+            hero["id"],
+            self.class_names.get(hero.get("mainClass"), "Unknown Class"),
+            self.class_names.get(hero.get("subClass"), "Unknown Class"),
+            hero.get("level", "Unknown"),
+            hero.get("professionStr", "Unknown Profession"),
+            hero.get("generation", "Unknown"),
+            hero.get("summonsRemaining", "Unknown"),
+            self.ability_names.get(hero.get("active1"), "Unknown"),
+            self.ability_names.get(hero.get("active2"), "Unknown"),
+            self.ability_names.get(hero.get("passive1"), "Unknown"),
+            self.ability_names.get(hero.get("passive2"), "Unknown"),
+            hero.get("network", "Unknown"),
+        )
+
+    def on_results_tree_click(self, event):
+        if self.results_tree.identify_region(event.x, event.y) != "cell":
+            return
+        if self.results_tree.identify_column(event.x) != "#1":
+            return
+        hero_id = self.results_tree.identify_row(event.y)
+        if hero_id:
+            self.toggle_result_selection(hero_id)
+
+    def on_results_tree_key(self, event):
+        hero_id = self.results_tree.focus()
+        if hero_id:
+            self.toggle_result_selection(hero_id)
+
+    def toggle_result_selection(self, hero_id):
+        hero = self.result_heroes[hero_id]
+        self.update_persistent_selection(
+            hero, hero_id not in self.persistent_selected_heroes
+        )
+
+    def update_persistent_selection(self, hero, selected):
+        self.set_persistent_selection([hero], selected)
+
+    def set_persistent_selection(self, heroes, selected):
+        # Applies a selection change to any number of heroes as one batched
+        # update of the results list and the Selected Heroes pane
+        added = []
+        removed = []
+        for hero in heroes:
+            hero_id = hero["id"]
+            if selected and hero_id not in self.persistent_selected_heroes:
+                self.persistent_selected_heroes[hero_id] = hero
+                added.append(hero)
+            elif not selected and hero_id in self.persistent_selected_heroes:
+                del self.persistent_selected_heroes[hero_id]
+                removed.append(hero_id)
+            else:
+                continue
+            if self.results_tree.exists(hero_id):
+                self.results_tree.set(
+                    hero_id, "selected", "\u2611" if selected else "\u2610"
+                )
+
+        self.update_selected_heroes_area(added=added, removed=removed)
+
+    def select_all_heroes(self):
+        all_selected = all(
+            hero_id in self.persistent_selected_heroes for hero_id in self.result_heroes
+        )
+        self.set_persistent_selection(self.result_heroes.values(), not all_selected)
+
+    def display_selected_heroes(self):
+        self.bridge_results_text.delete(1.0, tk.END)
+        for hero in self.persistent_selected_heroes.values():
+            self.insert_hero_row(self.bridge_results_text, hero)
+
+    def configure_row_tags(self, text_widget):
+        for tag, color in self.row_tag_colors.items():
+            text_widget.tag_config(tag, foreground=color)
+
+    def format_hero_row(self, hero):
+        # Builds a row straight from the hero's fields as alternating
+        # (text, tags) arguments, so one Text.insert call draws the whole row
+        main_class_value = hero.get("mainClass")
+        subclass_value = hero.get("subClass")
+        main_class_name = self.class_names.get(main_class_value, "Unknown Class")
+        sub_class_name = self.class_names.get(subclass_value, "Unknown Class")
+        level = hero.get("level", "Unknown")
+        profession = hero.get("professionStr", "Unknown Profession")
+        generation = hero.get("generation", "Unknown")
+
+        segments = [
+            "ID: ",
+            (),
+            f"{hero['id']}".ljust(13)[:13],
+            self.rarity_map.get(hero.get("rarity", 0), "common"),
+            " | Main Class: ",
+            (),
+            f"{main_class_name:<13}",
+            self.tier_tags.get(main_class_value, "basic_class"),
+            "| Sub Class:",
+            (),
+            f"{' ' + sub_class_name:<13}",
+            self.tier_tags.get(subclass_value, "basic_class"),
+            f" | Level: {str(level):<2} | Profession: {profession:<9}"
+            f" | Gen: {' ' + str(generation):<2}"
+            f" | Summons: {' ' + str(hero['summonsRemaining']):<3}",
+            (),
+        ]
+        for ability_key, field in (
+            ("A1", "active1"),
+            ("A2", "active2"),
+            ("P1", "passive1"),
+            ("P2", "passive2"),
+        ):
+            ability_value = hero.get(field, "Unknown")
+            segments += [
+                f" | {ability_key}: ",
+                (),
+                self.ability_names.get(ability_value, "Unknown"),
+                self.tier_tags.get(ability_value, "basic_class"),
+            ]
+        segments += [f" | Realm: {hero.get('network', 'Unknown')}\n", ()]
+        return segments
+
+    def insert_hero_row(self, text_widget, hero):
+        text_widget.insert(tk.END, *self.format_hero_row(hero))
+
+    def bridge_heroes(self):
+        password = self.password_entry.get()
+        script_dir = os.getcwd()
+        key_file_name = [f for f in os.listdir(script_dir) if f.endswith(".key")]
+        if not key_file_name:
+            self.async_log_to_ui("Key file not found.")
+            return
+
+        key_file_name = key_file_name[0]
+        private_key = self.decrypt_key(
+            os.path.join(script_dir, key_file_name), password
+        )
+
+        # Process the bridging pipeline on a separate thread
+        threading.Thread(
+            target=self.process_all_bridges,
+            args=(dict(self.persistent_selected_heroes), private_key),
+        ).start()
+
+    def process_all_bridges(self, heroes, private_key):
+        def on_bridged(hero_id):
+            self.master.after(
+                0,
+                lambda: self.update_results_area(
+                    {"action": "remove", "hero_id": hero_id}
+                ),
+            )
+
+        if not private_key:
+            self.async_log_to_ui("Failed to decrypt private key.")
+            return
+
+        try:
+            # Jobs left unfinished by an earlier run are settled first, and
+            # their heroes are not sent again as part of this batch
+            resumed, _ = resume_bridge_jobs(
+                private_key, self.async_log_to_ui, on_bridged
+            )
+            bridge_heroes_pipelined(
+                [item for item in heroes.items() if item[0] not in resumed],
+                private_key,
+                self.async_log_to_ui,
+                on_bridged,
+            )
+        except Exception as e:
+            self.async_log_to_ui(f"Error during bridging: {str(e)}")
+
+    def decrypt_key(self, key_file_path, password_provided):
+        try:
+            return decrypt_private_key(key_file_path, password_provided)
+        except Exception as e:
+            self.async_log_to_ui(f"Error decrypting key: {e}")
+            return None
+
+
+def main():
+    root = tk.Tk()
+    app = HeroSearchApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
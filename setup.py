@@ -4,7 +4,7 @@ setup(
     name='hero_bridge',
     version='1.0.0',  
     packages=find_packages(),  
-    py_modules=['hero_bridge'],
+    py_modules=['hero_bridge', 'hero_bridge_gui'],
     install_requires=[
         'cryptography>=40.0.2',
         'web3>=6.4.0',
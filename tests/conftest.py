@@ -0,0 +1,7 @@
+import os
+import sys
+
+# hero_bridge loads its ABI from the working directory at import time
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
@@ -0,0 +1,72 @@
+import pytest
+
+import hero_bridge
+
+ACCOUNT = "0xaccount"
+OTHER_ACCOUNT = "0xother"
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return hero_bridge.BridgeJournal(str(tmp_path / "bridge_journal.jsonl"))
+
+
+def test_missing_journal_has_no_unfinished_jobs(journal):
+    assert journal.unfinished() == {}
+
+
+def test_signed_fields_carry_through_later_states(journal):
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+    journal.record(
+        ACCOUNT, 1, "crystalvale", "signed", nonce=4, tx_hash="0xh", raw_tx="0xr"
+    )
+    journal.record(ACCOUNT, 1, "crystalvale", "broadcast")
+
+    job = journal.unfinished(ACCOUNT)["1"]
+    assert job["state"] == "broadcast"
+    assert job["network"] == "dfk"
+    assert (job["nonce"], job["tx_hash"], job["raw_tx"]) == (4, "0xh", "0xr")
+
+
+def test_finished_states_drop_out(journal):
+    for hero_id, state in enumerate(["mined", "reverted", "skipped", "dropped"]):
+        journal.record(ACCOUNT, hero_id, "crystalvale", "queued", network="dfk")
+        journal.record(ACCOUNT, hero_id, "crystalvale", state)
+    assert set(journal.unfinished(ACCOUNT)) == {"3"}
+
+
+def test_queued_starts_a_new_job(journal):
+    # A hero re-queued after a failed broadcast must not keep the old nonce
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+    journal.record(ACCOUNT, 1, "crystalvale", "signed", nonce=4, tx_hash="0xh")
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+
+    job = journal.unfinished(ACCOUNT)["1"]
+    assert job["state"] == "queued"
+    assert "nonce" not in job
+    assert "tx_hash" not in job
+
+
+def test_torn_last_line_is_ignored(journal):
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+    journal.record(ACCOUNT, 2, "crystalvale", "queued", network="kla")
+    journal.sync()
+    with open(journal.path, "a") as journal_file:
+        journal_file.write('{"account": "0xaccount", "hero_id": "2", "sta')
+
+    assert set(journal.unfinished(ACCOUNT)) == {"1", "2"}
+
+
+def test_jobs_are_filtered_by_account(journal):
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+    journal.record(OTHER_ACCOUNT, 2, "serendale2", "queued", network="kla")
+    journal.record(OTHER_ACCOUNT, 1, "crystalvale", "mined")
+
+    assert set(journal.unfinished(ACCOUNT)) == {"1"}
+    assert set(journal.unfinished(OTHER_ACCOUNT)) == {"2"}
+    assert set(journal.unfinished()) == {"1", "2"}
+
+
+def test_unfinished_sees_entries_not_yet_synced(journal):
+    journal.record(ACCOUNT, 1, "crystalvale", "queued", network="dfk")
+    assert set(journal.unfinished(ACCOUNT)) == {"1"}
@@ -0,0 +1,184 @@
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+import hero_bridge
+
+
+class FakeChain:
+    # Mines each transaction in its own block as soon as its nonce is next,
+    # and adds empty blocks after every send to stand in for a fast chain
+    def __init__(self, empty_blocks_per_send=0, dropped_nonces=(), scan_blind=False):
+        self.lock = threading.Lock()
+        self.blocks = [[]]
+        self.receipts = {}
+        self.signed = {}
+        self.queued = {}
+        self.next_nonce = 0
+        self.sends = []
+        self.empty_blocks_per_send = empty_blocks_per_send
+        # A nonce listed twice is dropped on both of its first two sends
+        self.dropped_nonces = list(dropped_nonces)
+        self.scan_blind = scan_blind
+
+    @property
+    def block_number(self):
+        with self.lock:
+            return len(self.blocks) - 1
+
+    def get_block(self, block_number):
+        with self.lock:
+            if self.scan_blind:
+                return {"transactions": []}
+            return {
+                "transactions": [HexBytes(key) for key in self.blocks[block_number]]
+            }
+
+    def get_transaction_receipt(self, tx_hash):
+        with self.lock:
+            tx_receipt = self.receipts.get(Web3.to_hex(HexBytes(tx_hash)))
+        if tx_receipt is None:
+            raise TransactionNotFound(Web3.to_hex(HexBytes(tx_hash)))
+        return tx_receipt
+
+    def get_transaction_count(self, address, block_identifier):
+        with self.lock:
+            return self.next_nonce
+
+    def send_raw_transaction(self, raw_tx):
+        nonce, tx_hash = self.signed[bytes(raw_tx)]
+        with self.lock:
+            self.sends.append(nonce)
+            if nonce in self.dropped_nonces:
+                self.dropped_nonces.remove(nonce)
+            elif nonce >= self.next_nonce:
+                self.queued[nonce] = Web3.to_hex(tx_hash)
+            while self.next_nonce in self.queued:
+                key = self.queued.pop(self.next_nonce)
+                self.blocks.append([key])
+                self.receipts[key] = {"status": 1, "gasUsed": 21000}
+                self.next_nonce += 1
+            self.blocks.extend([] for _ in range(self.empty_blocks_per_send))
+        return tx_hash
+
+
+@pytest.fixture
+def bridge(monkeypatch, tmp_path):
+    def install(chain, depth=10, tx_timeout_seconds=5):
+        w3 = SimpleNamespace(eth=chain)
+        client = SimpleNamespace(
+            config_key="crystalvale",
+            chain_id=hero_bridge.CONFIG["chain_ids"]["crystalvale"],
+            w3=w3,
+            account=SimpleNamespace(address="0xaccount"),
+            contract=SimpleNamespace(address="0xcontract"),
+            nonces=hero_bridge.NonceManager(w3, "0xaccount"),
+            receipt_tracker=hero_bridge.ReceiptTracker(w3),
+            fee_oracle=SimpleNamespace(current_fees=lambda: {}),
+        )
+
+        def build_send_hero_transaction(
+            account, contract_address, chain_id, hero_id, *args
+        ):
+            nonce = args[-3]
+            raw_tx = f"{hero_id}:{nonce}".encode()
+            tx_hash = HexBytes(Web3.keccak(raw_tx))
+            chain.signed[raw_tx] = (nonce, tx_hash)
+            return SimpleNamespace(hash=tx_hash, rawTransaction=HexBytes(raw_tx))
+
+        def track_arrival(hero_id, sent_at, ui_update_function):
+            arrival = Future()
+            arrival.set_result(0)
+            return arrival
+
+        monkeypatch.setitem(hero_bridge.CONFIG, "bridge_preflight", False)
+        monkeypatch.setitem(hero_bridge.CONFIG, "bridge_pipeline_depth", depth)
+        monkeypatch.setitem(
+            hero_bridge.CONFIG, "bridge_tx_timeout_seconds", tx_timeout_seconds
+        )
+        monkeypatch.setitem(hero_bridge.CONFIG, "receipt_poll_seconds", 0.01)
+        monkeypatch.setattr(hero_bridge, "get_chain_client", lambda *args: client)
+        monkeypatch.setattr(
+            hero_bridge,
+            "get_arrival_tracker",
+            lambda config_key: SimpleNamespace(track=track_arrival),
+        )
+        monkeypatch.setattr(
+            hero_bridge,
+            "gas_limit_cache",
+            SimpleNamespace(gas_limit=lambda *args: 100000, invalidate=print),
+        )
+        monkeypatch.setattr(
+            hero_bridge, "build_send_hero_transaction", build_send_hero_transaction
+        )
+        monkeypatch.setattr(
+            hero_bridge,
+            "bridge_journal",
+            hero_bridge.BridgeJournal(str(tmp_path / "bridge_journal.jsonl")),
+        )
+
+        def run(hero_count):
+            bridged = []
+            heroes_items = [
+                (str(hero_id), {"id": str(hero_id), "network": "dfk"})
+                for hero_id in range(1, hero_count + 1)
+            ]
+            started = time.monotonic()
+            hero_bridge.bridge_chain_heroes(
+                "crystalvale",
+                heroes_items,
+                "0xkey",
+                lambda message: None,
+                bridged.append,
+            )
+            return bridged, time.monotonic() - started
+
+        return run
+
+    return install
+
+
+def test_transactions_mined_during_the_window_are_seen(bridge):
+    # Three empty blocks per send puts the window's first transaction well
+    # behind a two-block look-back taken after the last send
+    chain = FakeChain(empty_blocks_per_send=3)
+    bridged, elapsed = bridge(chain, depth=10)(10)
+    assert bridged == [str(hero_id) for hero_id in range(1, 11)]
+    assert chain.sends == list(range(10))
+    assert elapsed < 2
+
+
+def test_receipt_missed_by_the_block_scan_is_looked_up_directly(bridge):
+    chain = FakeChain(scan_blind=True)
+    bridged, _ = bridge(chain, depth=3, tx_timeout_seconds=0.1)(3)
+    assert bridged == ["1", "2", "3"]
+    assert hero_bridge.bridge_journal.unfinished() == {}
+
+
+def test_dropped_lowest_nonce_is_rebroadcast_once(bridge):
+    chain = FakeChain(dropped_nonces=[0])
+    bridged, elapsed = bridge(chain, depth=5, tx_timeout_seconds=0.5)(5)
+    assert bridged == ["1", "2", "3", "4", "5"]
+    # Only the gap is sent again, not every transaction stuck behind it
+    assert chain.sends == [0, 1, 2, 3, 4, 0]
+    assert elapsed < 1.5
+
+
+def test_stuck_window_gives_up_after_one_shared_deadline(bridge):
+    chain = FakeChain(dropped_nonces=[0, 0])
+    bridged, elapsed = bridge(chain, depth=5, tx_timeout_seconds=0.5)(5)
+    assert bridged == []
+    assert chain.sends == [0, 1, 2, 3, 4, 0]
+    # Two timeouts for the whole window, not two per hero
+    assert elapsed < 2
+    assert set(hero_bridge.bridge_journal.unfinished()) == {"1", "2", "3", "4", "5"}
+    assert all(
+        job["state"] == "dropped"
+        for job in hero_bridge.bridge_journal.unfinished().values()
+    )
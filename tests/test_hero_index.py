@@ -0,0 +1,85 @@
+import pytest
+
+import hero_bridge
+
+PAGE_SIZE = 4
+ACCOUNT = "0xAccount"
+
+
+def make_hero(hero_id):
+    hero = {field: 0 for field in hero_bridge.HERO_FIELDS}
+    hero.update(id=str(hero_id), network="dfk", professionStr="mining")
+    return hero
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    state = {"heroes": [make_hero(hero_id) for hero_id in range(20, 0, -1)]}
+
+    def fetch_hero_page(variables, skip_number, ui_update_function, last_id=None):
+        if skip_number >= state.get("fail_at_skip", float("inf")):
+            return None
+        return state["heroes"][skip_number : skip_number + PAGE_SIZE]
+
+    monkeypatch.setitem(hero_bridge.CONFIG, "search_page_size", PAGE_SIZE)
+    monkeypatch.setitem(hero_bridge.CONFIG, "search_concurrency", 1)
+    monkeypatch.setitem(hero_bridge.CONFIG, "search_pagination", "skip")
+    monkeypatch.setattr(hero_bridge, "fetch_hero_page", fetch_hero_page)
+    return state
+
+
+@pytest.fixture
+def index(tmp_path):
+    return hero_bridge.HeroIndex(str(tmp_path / "hero_index.sqlite3"))
+
+
+def ids(heroes):
+    return [int(hero["id"]) for hero in heroes]
+
+
+def test_interrupted_first_sync_resumes_from_its_cursor(backend, index):
+    backend["fail_at_skip"] = 8
+    assert not index.sync(ACCOUNT, lambda message: None)
+    assert ids(index.load(ACCOUNT)) == list(range(20, 12, -1))
+
+    del backend["fail_at_skip"]
+    streamed = []
+    resumed = []
+    assert index.sync(
+        ACCOUNT,
+        lambda message: None,
+        on_page=streamed.extend,
+        on_resume=lambda: resumed.append(True),
+    )
+    # Only the heroes below the cursor are streamed, so the caller has to
+    # show the index rather than the stream
+    assert resumed == [True]
+    assert ids(streamed) == list(range(12, 0, -1))
+    assert ids(index.load(ACCOUNT)) == list(range(20, 0, -1))
+
+
+def test_first_sync_from_the_top_does_not_report_a_resume(backend, index):
+    streamed = []
+    resumed = []
+    assert index.sync(
+        ACCOUNT,
+        lambda message: None,
+        on_page=streamed.extend,
+        on_resume=lambda: resumed.append(True),
+    )
+    assert resumed == []
+    assert ids(streamed) == ids(index.load(ACCOUNT)) == list(range(20, 0, -1))
+
+
+def test_resumed_sync_prunes_only_below_the_cursor(backend, index):
+    backend["fail_at_skip"] = 8
+    index.sync(ACCOUNT, lambda message: None)
+
+    del backend["fail_at_skip"]
+    backend["heroes"] = [
+        hero for hero in backend["heroes"] if hero["id"] not in ("3", "4")
+    ]
+    assert index.sync(ACCOUNT, lambda message: None)
+    assert ids(index.load(ACCOUNT)) == [
+        hero_id for hero_id in range(20, 0, -1) if hero_id not in (3, 4)
+    ]
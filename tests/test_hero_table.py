@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+import hero_bridge
+
+PROFESSIONS = ["foraging", "fishing", "gardening", "mining"]
+
+
+def make_hero(hero_id, rng):
+    return {
+        "id": str(hero_id),
+        "mainClass": rng.randrange(12),
+        "subClass": rng.randrange(12),
+        "summonsRemaining": rng.randrange(11),
+        "generation": rng.randrange(15),
+        "rarity": rng.randrange(5),
+        "level": rng.randrange(1, 21),
+        "network": rng.choice(["dfk", "kla"]),
+        "professionStr": rng.choice(PROFESSIONS),
+    }
+
+
+def matches(hero, variables):
+    for column, (low_key, high_key) in hero_bridge.HERO_TABLE_RANGE_COLUMNS.items():
+        if hero.get(column) is None:
+            return False
+        if not variables[low_key] <= hero[column] <= variables[high_key]:
+            return False
+    for column, key in hero_bridge.HERO_TABLE_SET_COLUMNS.items():
+        if variables[key] and hero.get(column) not in variables[key]:
+            return False
+    return True
+
+
+def random_variables(rng):
+    low_summons = rng.randrange(11)
+    low_gen = rng.randrange(15)
+    low_level = rng.randrange(21)
+    return hero_bridge.build_search_variables(
+        "0xowner",
+        main_class=rng.sample(range(12), rng.randrange(4)),
+        sub_class=rng.sample(range(12), rng.randrange(4)),
+        min_summon=low_summons,
+        max_summon=rng.randrange(low_summons, 11),
+        min_gen=low_gen,
+        max_gen=rng.randrange(low_gen, 15),
+        min_rarity=rng.randrange(3),
+        max_rarity=rng.randrange(2, 5),
+        min_level=low_level,
+        max_level=rng.randrange(low_level, 21),
+        cv=rng.random() < 0.5,
+        sd=rng.random() < 0.5,
+        foraging=rng.random() < 0.3,
+        fishing=rng.random() < 0.3,
+        gardening=rng.random() < 0.3,
+        mining=rng.random() < 0.3,
+    )
+
+
+@pytest.mark.parametrize("hero_count", [0, 1, 7, 8, 9, 500])
+def test_filter_matches_a_row_by_row_scan(hero_count):
+    rng = random.Random(hero_count)
+    heroes = [make_hero(hero_id, rng) for hero_id in range(hero_count, 0, -1)]
+    table = hero_bridge.HeroTable(heroes)
+    for _ in range(50):
+        variables = random_variables(rng)
+        expected = [hero for hero in heroes if matches(hero, variables)]
+        assert table.filter(variables) == expected
+
+
+def test_default_filter_keeps_every_hero_in_order():
+    rng = random.Random(1)
+    heroes = [make_hero(hero_id, rng) for hero_id in range(100, 0, -1)]
+    table = hero_bridge.HeroTable(heroes)
+    assert table.filter(hero_bridge.build_search_variables("0xowner")) == heroes
+
+
+def test_class_ranges_and_lists_select_those_classes():
+    heroes = [
+        dict(make_hero(main_class, random.Random(0)), mainClass=main_class)
+        for main_class in range(12)
+    ]
+    variables = hero_bridge.build_search_variables(
+        "0xowner", main_class=["0-2, [5;7], 11"], max_summon=999, max_level=20
+    )
+    table = hero_bridge.HeroTable(heroes)
+    assert [hero["mainClass"] for hero in table.filter(variables)] == [
+        0,
+        1,
+        2,
+        5,
+        7,
+        11,
+    ]
+
+
+def test_heroes_missing_a_range_column_never_match():
+    hero = make_hero(1, random.Random(0))
+    del hero["level"]
+    table = hero_bridge.HeroTable([hero])
+    assert table.filter(hero_bridge.build_search_variables("0xowner")) == []
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+import hero_bridge
+
+PAGE_SIZE = 4
+
+
+class FakeBackend:
+    def __init__(self, hero_count, fail_at_skip=None):
+        self.heroes = [{"id": str(hero_id)} for hero_id in range(hero_count, 0, -1)]
+        self.fail_at_skip = fail_at_skip
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch_hero_page(self, variables, skip_number, ui_update_function, last_id=None):
+        with self.lock:
+            self.calls.append((skip_number, last_id))
+        if last_id is None:
+            if skip_number == self.fail_at_skip:
+                return None
+            # Later windows finish first, so merging has to restore the order
+            time.sleep(0.001 * (10 - skip_number // PAGE_SIZE % 10))
+            return self.heroes[skip_number : skip_number + PAGE_SIZE]
+        start = next(
+            index
+            for index, hero in enumerate(self.heroes + [{"id": "0"}])
+            if int(hero["id"]) < int(last_id)
+        )
+        return self.heroes[start : start + PAGE_SIZE]
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    def install(hero_count, **kwargs):
+        fake = FakeBackend(hero_count, **kwargs)
+        monkeypatch.setattr(hero_bridge, "fetch_hero_page", fake.fetch_hero_page)
+        return fake
+
+    monkeypatch.setitem(hero_bridge.CONFIG, "search_page_size", PAGE_SIZE)
+    return install
+
+
+def ids(heroes):
+    return [int(hero["id"]) for hero in heroes]
+
+
+@pytest.mark.parametrize("pagination", ["skip", "keyset"])
+@pytest.mark.parametrize("hero_count", [0, 3, 4, 17, 40])
+def test_fetch_heroes_returns_every_hero_in_id_desc_order(
+    backend, pagination, hero_count
+):
+    backend(hero_count)
+    result = hero_bridge.fetch_heroes({}, 3, print, pagination=pagination)
+    assert result.complete
+    assert result.cursor is None
+    assert ids(result.heroes) == list(range(hero_count, 0, -1))
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 5])
+def test_on_page_sees_pages_in_order(backend, concurrency):
+    backend(21)
+    pages = []
+    result = hero_bridge.fetch_heroes({}, concurrency, print, on_page=pages.append)
+    assert [hero for page in pages for hero in page] == result.heroes
+    assert ids(result.heroes) == list(range(21, 0, -1))
+
+
+def test_skip_stops_launching_windows_after_a_short_page(backend):
+    fake = backend(10)
+    hero_bridge.fetch_heroes({}, 2, print)
+    assert max(skip for skip, _ in fake.calls) <= 12
+
+
+def test_failed_skip_page_returns_a_resumable_cursor(backend):
+    fake = backend(20, fail_at_skip=8)
+    result = hero_bridge.fetch_heroes({}, 3, lambda message: None)
+    assert not result.complete
+    assert result.cursor == 8
+    assert ids(result.heroes) == list(range(20, 12, -1))
+
+    fake.fail_at_skip = None
+    rest = hero_bridge.fetch_heroes(
+        {}, 3, lambda message: None, resume_from=result.cursor
+    )
+    assert rest.complete
+    assert ids(result.heroes + rest.heroes) == list(range(20, 0, -1))
+
+
+def test_keyset_resumes_after_the_last_id(backend):
+    fake = backend(10)
+    result = hero_bridge.fetch_heroes(
+        {}, 1, print, pagination="keyset", resume_from="7"
+    )
+    assert ids(result.heroes) == [6, 5, 4, 3, 2, 1]
+    assert fake.calls[0] == (0, "7")
+
+
+def test_cancel_event_stops_paging(backend):
+    backend(40)
+    cancel_event = threading.Event()
+    result = hero_bridge.fetch_heroes(
+        {},
+        1,
+        print,
+        pagination="keyset",
+        on_page=lambda page: cancel_event.set(),
+        cancel_event=cancel_event,
+    )
+    assert not result.complete
+    assert ids(result.heroes) == [40, 39, 38, 37]
+    assert result.cursor == "37"
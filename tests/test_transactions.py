@@ -0,0 +1,65 @@
+import pytest
+from eth_account import Account
+from eth_account._utils.typed_transactions import TypedTransaction
+from hexbytes import HexBytes
+from web3 import Web3
+
+import hero_bridge
+
+PRIVATE_KEY = "0x" + "42" * 32
+
+
+@pytest.fixture(scope="module")
+def contract():
+    return Web3().eth.contract(
+        address=Web3.to_checksum_address(
+            hero_bridge.CONFIG["contract_addresses"]["crystalvale"]
+        ),
+        abi=hero_bridge.HERO_BRIDGE_ABI,
+    )
+
+
+@pytest.mark.parametrize(
+    "hero_id, destination_chain_id",
+    [(0, 0), (1, 8217), (123456789, 53935), ("42", "8217"), (2**256 - 1, 1)],
+)
+def test_encode_send_hero_call_matches_contract_abi(
+    contract, hero_id, destination_chain_id
+):
+    assert hero_bridge.encode_send_hero_call(
+        hero_id, destination_chain_id
+    ) == contract.encodeABI(
+        fn_name="sendHero", args=[int(hero_id), int(destination_chain_id)]
+    )
+
+
+def test_build_send_hero_transaction_signs_every_field():
+    account = Account.from_key(PRIVATE_KEY)
+    fees_in_wei = {"maxFeePerGas": 30 * 10**9, "maxPriorityFeePerGas": 2 * 10**9}
+    signed_tx = hero_bridge.build_send_hero_transaction(
+        account,
+        hero_bridge.CONFIG["contract_addresses"]["crystalvale"],
+        53935,
+        1234,
+        8217,
+        10**16,
+        7,
+        fees_in_wei,
+        150000,
+    )
+
+    raw_tx = HexBytes(signed_tx.rawTransaction)
+    tx = TypedTransaction.from_bytes(raw_tx).as_dict()
+    assert Account.recover_transaction(raw_tx) == account.address
+    assert tx["chainId"] == 53935
+    assert tx["nonce"] == 7
+    assert tx["gas"] == 150000
+    assert tx["value"] == 10**16
+    assert tx["maxFeePerGas"] == fees_in_wei["maxFeePerGas"]
+    assert tx["maxPriorityFeePerGas"] == fees_in_wei["maxPriorityFeePerGas"]
+    assert HexBytes(tx["to"]) == HexBytes(
+        hero_bridge.CONFIG["contract_addresses"]["crystalvale"]
+    )
+    assert HexBytes(tx["data"]) == HexBytes(
+        hero_bridge.encode_send_hero_call(1234, 8217)
+    )